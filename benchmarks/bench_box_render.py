@@ -0,0 +1,71 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from calcul_gemoetrie import ShapeView3D
+
+
+def legacy_parallelepiped(view, lungime, latime, inaltime):
+    view._begin()
+    ax = view.ax
+
+    coordonate_x = [-lungime/2, lungime/2]
+    coordonate_y = [-latime/2, latime/2]
+    coordonate_z = [-inaltime/2, inaltime/2]
+
+    X, Y = np.meshgrid(coordonate_x, coordonate_y)
+    view._artists.append(ax.plot_surface(X, Y, np.ones_like(X) * coordonate_z[1], alpha=0.6, color='lightblue'))
+    view._artists.append(ax.plot_surface(X, Y, np.ones_like(X) * coordonate_z[0], alpha=0.6, color='lightblue'))
+
+    X, Z = np.meshgrid(coordonate_x, coordonate_z)
+    view._artists.append(ax.plot_surface(X, np.ones_like(X) * coordonate_y[1], Z, alpha=0.6, color='lightgreen'))
+    view._artists.append(ax.plot_surface(X, np.ones_like(X) * coordonate_y[0], Z, alpha=0.6, color='lightgreen'))
+
+    Y, Z = np.meshgrid(coordonate_y, coordonate_z)
+    view._artists.append(ax.plot_surface(np.ones_like(Y) * coordonate_x[1], Y, Z, alpha=0.6, color='lightcoral'))
+    view._artists.append(ax.plot_surface(np.ones_like(Y) * coordonate_x[0], Y, Z, alpha=0.6, color='lightcoral'))
+
+    dim_max = max(lungime, latime, inaltime)
+    view._set_limits([-dim_max, dim_max], [-dim_max, dim_max], [-dim_max, dim_max],
+                     f'Paralelpiped {lungime}x{latime}x{inaltime}')
+
+
+def measure(draw, repeat):
+    view = ShapeView3D(Figure(figsize=(6, 5), dpi=100))
+    canvas = FigureCanvasAgg(view.figure)
+    build, total = [], []
+    for i in range(repeat):
+        dimensions = (1 + i % 5, 2 + i % 3, 3 + i % 4)
+        start = time.perf_counter()
+        draw(view, *dimensions)
+        built = time.perf_counter()
+        canvas.draw()
+        end = time.perf_counter()
+        build.append((built - start) * 1000)
+        total.append((end - start) * 1000)
+    return statistics.median(build), statistics.median(total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timp de desenare pentru cub/paralelpiped")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for name, draw in (("6 x plot_surface", legacy_parallelepiped),
+                       ("1 x Poly3DCollection", ShapeView3D.draw_parallelepiped)):
+        build, total = measure(draw, args.repeat)
+        print(f"{name:22s} constructie {build:6.2f} ms, constructie + randare {total:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
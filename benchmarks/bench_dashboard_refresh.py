@@ -0,0 +1,133 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from calcul_gemoetrie import DashboardCharts
+
+SHAPES = ["dreptunghi", "patrat", "cerc", "triunghi", "cub", "paralelpiped", "sfera", "prisma"]
+PANELS = ["shapes_frequency", "dimensions_frequency", "calculations_by_hour", "calculations_by_day"]
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def synthetic_stats(step):
+    rng = random.Random(step)
+    shapes = {shape: 100 + step * (i + 1) + rng.randint(0, 5) for i, shape in enumerate(SHAPES)}
+    return {
+        'shapes_frequency': shapes,
+        'dimensions_frequency': {'2D': sum(list(shapes.values())[:4]), '3D': sum(list(shapes.values())[4:])},
+        'calculations_by_hour': {hour: 10 + step + rng.randint(0, 20) for hour in range(24)},
+        'calculations_by_day': {f'2026-10-{day:02d}': 50 + step + rng.randint(0, 50) for day in range(11, 18)},
+    }
+
+
+def legacy_refresh(stats):
+    # The original update_charts: a new figure and canvas on every refresh, built
+    # with the same calls (including plt.tight_layout(), which laid out pyplot's
+    # current figure rather than this one). Destroying and packing the Tk widget
+    # is the only part that needs a display and is left out.
+    fig = Figure(figsize=(12, 8), dpi=100)
+
+    if stats['shapes_frequency']:
+        ax1 = fig.add_subplot(221)
+        shapes = list(stats['shapes_frequency'].keys())
+        counts = list(stats['shapes_frequency'].values())
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
+        ax1.pie(counts, labels=shapes, autopct='%1.1f%%', colors=colors[:len(shapes)])
+        ax1.set_title('Distributia Formelor Geometrice')
+
+    if stats['dimensions_frequency']:
+        ax2 = fig.add_subplot(222)
+        dimensions = list(stats['dimensions_frequency'].keys())
+        counts = list(stats['dimensions_frequency'].values())
+        bars = ax2.bar(dimensions, counts, color=['#3498db', '#e74c3c'])
+        ax2.set_title('Calcule 2D vs 3D')
+        ax2.set_ylabel('Numarul de calcule')
+        for bar in bars:
+            height = bar.get_height()
+            ax2.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}', ha='center', va='bottom')
+
+    if stats['calculations_by_hour']:
+        ax3 = fig.add_subplot(223)
+        hours = sorted(stats['calculations_by_hour'].keys())
+        counts = [stats['calculations_by_hour'][h] for h in hours]
+        ax3.plot(hours, counts, marker='o', linewidth=2, markersize=6, color='#2ecc71')
+        ax3.set_title('Activitate pe Ore')
+        ax3.set_xlabel('Ora zilei')
+        ax3.set_ylabel('Numarul de calcule')
+        ax3.grid(True, alpha=0.3)
+
+    if stats['calculations_by_day']:
+        ax4 = fig.add_subplot(224)
+        days = sorted(stats['calculations_by_day'].keys())[-7:]
+        counts = [stats['calculations_by_day'][d] for d in days]
+        day_labels = [d.split('-')[2] + '/' + d.split('-')[1] for d in days]
+        ax4.bar(day_labels, counts, color='#9b59b6')
+        ax4.set_title('Trend Ultimele 7 Zile')
+        ax4.set_xlabel('Data')
+        ax4.set_ylabel('Calcule')
+        plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
+
+    plt.tight_layout()
+    FigureCanvasAgg(fig).draw()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timp si RSS pentru refresh-ul dashboard-ului")
+    parser.add_argument("--refreshes", type=int, default=1000)
+    parser.add_argument("--legacy", action="store_true",
+                        help="Reconstruieste figura la fiecare refresh (comportamentul vechi)")
+    parser.add_argument("--changed", choices=["all"] + PANELS, default="all",
+                        help="Panoul ale carui date se schimba la fiecare refresh (implicit toate)")
+    args = parser.parse_args()
+
+    if not args.legacy:
+        charts = DashboardCharts(Figure(figsize=(12, 8), dpi=100))
+        canvas = FigureCanvasAgg(charts.figure)
+
+    timings = []
+    rss = []
+    first = synthetic_stats(0)
+    for step in range(args.refreshes):
+        stats = synthetic_stats(step)
+        if args.changed != "all":
+            stats = dict(first, **{args.changed: stats[args.changed]})
+        start = time.perf_counter()
+        if args.legacy:
+            legacy_refresh(stats)
+        else:
+            charts.redraw(canvas, charts.update(stats))
+        timings.append((time.perf_counter() - start) * 1000)
+        rss.append(rss_mb())
+
+    window = max(1, args.refreshes // 10)
+    print(f"refresh-uri: {args.refreshes} ({'legacy' if args.legacy else 'figura persistenta'}, "
+          f"se schimba: {args.changed})")
+    print(f"timp/refresh: median {statistics.median(timings):.1f} ms, "
+          f"primele {window} {statistics.mean(timings[:window]):.1f} ms, "
+          f"ultimele {window} {statistics.mean(timings[-window:]):.1f} ms")
+    print(f"RSS: dupa primul refresh {rss[0]:.1f} MB, dupa {window} {rss[window - 1]:.1f} MB, "
+          f"final {rss[-1]:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ("calcul_gemoetrie", "geometry_engine", "geometry_batch")
+HEAVY = ("tkinter", "matplotlib", "mpl_toolkits", "numpy")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeat):
+    samples = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+                                cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output)
+        samples.append(result["ms"])
+        heavy = result["heavy"]
+    return min(samples), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timpul de import al modulelor calculatorului")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="Buget pentru calcul_gemoetrie (matematica + DataManager)")
+    args = parser.parse_args()
+
+    over_budget = False
+    for module in MODULES:
+        ms, heavy = measure(module, args.repeat)
+        note = f", incarca {', '.join(heavy)}" if heavy else ""
+        print(f"{module:20s} {ms:7.1f} ms{note}")
+        if module == "calcul_gemoetrie" and (ms > args.budget_ms or heavy):
+            over_budget = True
+
+    if over_budget:
+        print(f"calcul_gemoetrie depaseste bugetul de {args.budget_ms:.0f} ms sau incarca module GUI")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import geometry_engine
+from geometry_batch import parallel_compute
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalarea calculului in lot pe mai multe nuclee")
+    parser.add_argument("--shape", default="prisma", choices=sorted(geometry_engine.SHAPES))
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--shard-size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _, names = geometry_engine.SHAPES[args.shape]
+    rng = np.random.default_rng(0)
+    parametri = rng.uniform(1, 10, size=(args.rows, len(names)))
+
+    start = time.perf_counter()
+    geometry_engine.compute(args.shape, parametri)
+    baseline = time.perf_counter() - start
+    print(f"{args.shape}, {args.rows} randuri")
+    print(f"  un proces (fara pool): {args.rows / baseline / 1e6:8.2f} M randuri/s")
+
+    cores = os.cpu_count() or 1
+    for workers in sorted({1, 2, 4, cores}):
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parallel_compute(args.shape, parametri[:workers], executor=executor, shard_size=1)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                parallel_compute(args.shape, parametri, shard_size=args.shard_size, executor=executor)
+                best = min(best, time.perf_counter() - start)
+        print(f"  {workers:3d} procese: {args.rows / best / 1e6:8.2f} M randuri/s "
+              f"(x{baseline / best:.2f} fata de un proces)")
+
+
+if __name__ == "__main__":
+    main()
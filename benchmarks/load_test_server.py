@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import geometry_engine
+from calcul_gemoetrie import DataManager
+from geometry_server import CalculationServer
+
+
+def random_item(rng):
+    shape_type = rng.choice(list(geometry_engine.SHAPES))
+    _, nume = geometry_engine.SHAPES[shape_type]
+    if shape_type in ("triunghi", "prisma"):
+        parametri = {"a": 3.0, "b": 4.0, "c": 5.0}
+        if shape_type == "prisma":
+            parametri["inaltime"] = round(rng.uniform(1, 20), 2)
+    else:
+        parametri = {n: round(rng.uniform(1, 20), 2) for n in nume}
+    return {"shape_type": shape_type, "parameters": parametri}
+
+
+def build_request(host, path, payload):
+    body = json.dumps(payload).encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+
+async def client(host, port, requests, batch_size, latencies, errors, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            if batch_size > 1:
+                request = build_request(host, "/batch", {"items": [random_item(rng) for _ in range(batch_size)]})
+            else:
+                request = build_request(host, "/calculate", random_item(rng))
+
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0].decode())
+    finally:
+        writer.close()
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    server = None
+    host, port = args.host, args.port
+    if port == 0:
+        db_path = None if args.no_log else os.path.join(tempfile.mkdtemp(), "load_test.db")
+        server = CalculationServer(DataManager(db_path, buffered=True) if db_path else None)
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, args.requests, args.batch_size, latencies, errors, seed)
+        for seed in range(args.clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        listener.close()
+        await listener.wait_closed()
+        await server.stop()
+
+    cereri = len(latencies)
+    print(f"{args.clients} clienti x {args.requests} cereri (lot {args.batch_size}) pe {host}:{port}")
+    print(f"  {cereri} cereri in {elapsed:.2f}s: {cereri / elapsed:,.0f} cereri/s, "
+          f"{cereri * args.batch_size / elapsed:,.0f} calcule/s")
+    print(f"  latenta p50 {percentile(latencies, 50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:.2f} ms, max {max(latencies) * 1000:.2f} ms")
+    if errors:
+        print(f"  {len(errors)} erori, de ex. {errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de incarcare pentru geometry_server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0,
+                        help="Portul unui server pornit separat; 0 porneste un server in acelasi proces")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=20, help="Cereri per client")
+    parser.add_argument("--batch-size", type=int, default=1, help="Forme per cerere (>1 foloseste /batch)")
+    parser.add_argument("--no-log", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
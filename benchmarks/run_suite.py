@@ -0,0 +1,227 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import geometry_engine
+from calcul_gemoetrie import DataManager
+from geometry_workload import generate
+
+SECTIONS = ("formulas", "logging", "statistics", "rendering")
+SAMPLE_PARAMETERS = {
+    "dreptunghi": (4.0, 3.0),
+    "patrat": (5.0,),
+    "cerc": (2.5,),
+    "triunghi": (3.0, 4.0, 5.0),
+    "cub": (3.0,),
+    "paralelpiped": (2.0, 3.0, 4.0),
+    "sfera": (1.5,),
+    "prisma": (3.0, 4.0, 5.0, 10.0),
+}
+
+
+def timed(function, repeat, *args):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        function(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return {
+        "median_ms": statistics.median(samples) / 1e6,
+        "min_ms": min(samples) / 1e6,
+        "max_ms": max(samples) / 1e6,
+        "repeat": repeat,
+    }
+
+
+def bench_formulas(args):
+    import numpy as np
+
+    results = {}
+    rng = np.random.default_rng(0)
+    for shape_type, scalars in SAMPLE_PARAMETERS.items():
+        formula = geometry_engine.FORMULAS[shape_type]
+
+        def scalar_loop():
+            for _ in range(args.scalar_calls):
+                formula(*scalars)
+
+        scalar = timed(scalar_loop, args.repeat)
+        scalar["calls_per_s"] = args.scalar_calls / (scalar["min_ms"] / 1000)
+        results[f"formula.scalar.{shape_type}"] = scalar
+
+        columns = [rng.uniform(3, 5, args.vector_rows) for _ in scalars]
+        vector = timed(formula, args.repeat, *columns)
+        vector["rows_per_s"] = args.vector_rows / (vector["min_ms"] / 1000)
+        results[f"formula.vector.{shape_type}"] = vector
+    return results
+
+
+def bench_logging(args, workdir):
+    results = {}
+    for name, buffered, calls in (("unbuffered", False, args.log_calls_unbuffered),
+                                  ("buffered", True, args.log_calls)):
+        path = os.path.join(workdir, f"log_{name}.db")
+        with DataManager(path, buffered=buffered) as data_manager:
+            start = time.perf_counter_ns()
+            for i in range(calls):
+                data_manager.log_calculation("cerc", "2D", {"raza": float(i)}, result_area=1.0,
+                                             result_perimeter=1.0, calculation_time_ms=0.01,
+                                             compute_ns=10_000)
+            data_manager.flush()
+            elapsed = time.perf_counter_ns() - start
+        results[f"log_calculation.{name}"] = {
+            "rows": calls,
+            "total_ms": elapsed / 1e6,
+            "rows_per_s": calls / (elapsed / 1e9),
+        }
+    return results
+
+
+def bench_statistics(args, workdir):
+    results = {}
+    for rows in args.stat_rows:
+        path = os.path.join(workdir, f"stats_{rows}.db")
+        _, load_s = generate(path, rows)
+        with DataManager(path, buffered=True) as data_manager:
+            data_manager.get_statistics()
+            result = timed(data_manager.get_statistics, args.repeat)
+        result["rows"] = rows
+        result["load_s"] = load_s
+        results[f"get_statistics.{rows}"] = result
+        os.remove(path)
+    return results
+
+
+def bench_rendering(args):
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from calcul_gemoetrie import ShapeView2D, ShapeView3D
+
+    views = (
+        (ShapeView2D, (5, 4), (("draw_rectangle", (4.0, 3.0)), ("draw_square", (5.0,)),
+                               ("draw_circle", (2.5,)), ("draw_triangle", (3.0, 4.0, 5.0)))),
+        (ShapeView3D, (6, 5), (("draw_cube", (3.0,)), ("draw_parallelepiped", (2.0, 3.0, 4.0)),
+                               ("draw_sphere", (1.5,)), ("draw_prism", (3.0, 4.0, 5.0, 10.0)))),
+    )
+
+    results = {}
+    for view_class, figsize, methods in views:
+        view = view_class(Figure(figsize=figsize, dpi=100))
+        canvas = FigureCanvasAgg(view.figure)
+        if view_class is ShapeView2D:
+            view.attach(canvas)
+            present = view.render
+        else:
+            present = canvas.draw
+        for method, parameters in methods:
+            draw = getattr(view, method)
+            scales = itertools.count(1)
+
+            def render():
+                # New dimensions change the axis limits, so ShapeView2D.render cannot
+                # reuse its cached background and does a full Agg draw every time.
+                scale = 1 + next(scales) / 10
+                draw(*(value * scale for value in parameters))
+                present()
+
+            def redraw():
+                draw(*parameters)
+                present()
+
+            render()
+            results[f"render.{view_class.__name__}.{method}"] = timed(render, args.repeat)
+            if view_class is ShapeView2D:
+                redraw()
+                results[f"render.{view_class.__name__}.{method}.blit"] = timed(redraw, args.repeat)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\nfata de {baseline_path}:")
+    for name, values in results.items():
+        old = baseline.get(name)
+        key = "median_ms" if "median_ms" in values else "total_ms"
+        if old and old.get(key):
+            print(f"  {name:45s} {old[key]:10.3f} -> {values[key]:10.3f} ms "
+                  f"(x{values[key] / old[key]:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Suita de benchmark-uri: formule, log_calculation, get_statistics, randare Agg")
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=SECTIONS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scalar-calls", type=int, default=10_000)
+    parser.add_argument("--vector-rows", type=int, default=1_000_000)
+    parser.add_argument("--log-calls", type=int, default=100_000)
+    parser.add_argument("--log-calls-unbuffered", type=int, default=500)
+    parser.add_argument("--stat-rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--output", help="Fisier JSON cu rezultatele "
+                                         "(implicit benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", metavar="JSON", help="Rezultate anterioare pentru comparatie")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for section in args.only:
+            start = time.perf_counter()
+            if section == "formulas":
+                results.update(bench_formulas(args))
+            elif section == "logging":
+                results.update(bench_logging(args, workdir))
+            elif section == "statistics":
+                results.update(bench_statistics(args, workdir))
+            else:
+                results.update(bench_rendering(args))
+            print(f"{section}: {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    for name, values in results.items():
+        summary = ", ".join(f"{key} {value:,.3f}" if isinstance(value, float) else f"{key} {value}"
+                            for key, value in values.items())
+        print(f"{name:45s} {summary}")
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", f"{revision}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "revision": revision,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"rezultate salvate in {output}", file=sys.stderr)
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
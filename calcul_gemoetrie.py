@@ -1,43 +1,178 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import math
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import numpy as np
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-from mpl_toolkits.mplot3d import Axes3D
-from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import sqlite3
-import json
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict, Counter, OrderedDict
 import threading
+import queue
 import time
+import atexit
+import argparse
+import os
+import sys
+import cProfile
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import chain
+
+def _load_tk():
+    global tk, ttk, messagebox
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
+def _load_matplotlib():
+    global patches, Figure, Bbox, IdentityTransform
+    import matplotlib.patches as patches
+    from matplotlib.figure import Figure
+    from matplotlib.transforms import Bbox, IdentityTransform
+
+def _load_tkagg():
+    global FigureCanvasTkAgg
+    _load_tk()
+    _load_matplotlib()
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+def _load_mplot3d():
+    global np, Poly3DCollection
+    _load_matplotlib()
+    import numpy as np
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+PARAMETER_COLUMNS = ('lungime', 'latime', 'latura', 'raza', 'a', 'b', 'c', 'inaltime')
+CALCULATION_COLUMNS = ('shape_type', 'shape_dimension', 'result_area', 'result_perimeter',
+                       'result_volume', 'calculation_time_ms', 'timestamp', 'session_id',
+                       'compute_ns', 'log_ns', 'render_ns') + PARAMETER_COLUMNS
+PARAMETER_SET = frozenset(PARAMETER_COLUMNS)
+
+STAGES = ('compute', 'log', 'render')
+# Missing values in rows built by make_row. SQLite stores a bound NaN as NULL, and
+# sqlite3 binds a float directly while None goes through the adapter lookup, which
+# made the NULL columns half the cost of an insert.
+NULL = float('nan')
+_NULL_PARAMETERS = (NULL,) * len(PARAMETER_COLUMNS)
+SPAN_BINS_PER_OCTAVE = 4
+
+
+_SQL_LOG2 = None
+
+
+def _sql_functions(conn):
+    # log2() needs SQLite built with math functions; register the Python one otherwise.
+    global _SQL_LOG2
+    if _SQL_LOG2 is None:
+        try:
+            sqlite3.connect(':memory:').execute('SELECT log2(2)')
+            _SQL_LOG2 = True
+        except sqlite3.OperationalError:
+            _SQL_LOG2 = False
+    if not _SQL_LOG2:
+        conn.create_function('log2', 1, math.log2, deterministic=True)
+
+
+# One INSERT binds up to 32766 variables since SQLite 3.32 (999 before).
+ROWS_PER_INSERT = 500 if sqlite3.sqlite_version_info >= (3, 32) else 999 // len(CALCULATION_COLUMNS)
+
+
+@lru_cache(maxsize=16)
+def _insert_sql(rows):
+    values = f"({', '.join('?' * len(CALCULATION_COLUMNS))})"
+    return f"INSERT INTO calculations ({', '.join(CALCULATION_COLUMNS)}) VALUES {', '.join([values] * rows)}"
+
+
+def _span_bin(ns):
+    return int(math.log2(max(ns, 1)) * SPAN_BINS_PER_OCTAVE)
+
+
+def _span_ms(span_bin):
+    return 2 ** ((span_bin + 0.5) / SPAN_BINS_PER_OCTAVE) / 1e6
 
 class DataManager:
-    def __init__(self, db_path="geometry_analytics.db"):
+    TABLE_SQL = f'''
+        CREATE TABLE IF NOT EXISTS calculations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            shape_type TEXT NOT NULL,
+            shape_dimension TEXT NOT NULL,
+            result_area REAL,
+            result_perimeter REAL,
+            result_volume REAL,
+            calculation_time_ms REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            session_id TEXT,
+            compute_ns INTEGER,
+            log_ns INTEGER,
+            render_ns INTEGER,
+            {', '.join(f'{name} REAL' for name in PARAMETER_COLUMNS)}
+        )
+    '''
+    INDEXES = (
+        ('idx_calculations_timestamp', 'timestamp'),
+        ('idx_calculations_shape_type', 'shape_type'),
+        ('idx_calculations_session_id', 'session_id'),
+    )
+
+    def __init__(self, db_path="geometry_analytics.db", buffered=False,
+                 flush_rows=1000, flush_interval=1.0, retention_days=None,
+                 archive=True, hourly_days=90, read_only=False):
         self.db_path = db_path
+        self.read_only = read_only
+        self.buffered = buffered
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.archive = archive
+        self.hourly_days = hourly_days
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._timestamp_second = None
+        self._timestamp_text = None
+        if read_only:
+            # Readers such as geometry_export must not create, migrate or vacuum the database.
+            if buffered:
+                raise ValueError("O baza deschisa doar pentru citire nu poate fi bufferata")
+            if not os.path.isfile(db_path):
+                raise FileNotFoundError(f"Baza de date nu exista: {db_path}")
+            return
         self.init_database()
     
+        if buffered:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            atexit.register(self.close)
+            if flush_interval:
+                self._closed = threading.Event()
+                threading.Thread(target=self._flush_periodically, daemon=True).start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
     def init_database(self):
         conn = sqlite3.connect(self.db_path)
+        try:
+            self._init_database(conn)
+        finally:
+            conn.close()
+
+    def _init_database(self, conn):
         cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS calculations (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                shape_type TEXT NOT NULL,
-                shape_dimension TEXT NOT NULL,
-                parameters TEXT NOT NULL,
-                result_area REAL,
-                result_perimeter REAL,
-                result_volume REAL,
-                calculation_time_ms REAL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                session_id TEXT
-            )
-        ''')
+        cursor.execute('PRAGMA auto_vacuum=INCREMENTAL')
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'calculations_json'")
+        interrupted = cursor.fetchone() is not None
+        cursor.execute(self.TABLE_SQL)
+
+        cursor.execute('PRAGMA table_info(calculations)')
+        columns = {row[1] for row in cursor.fetchall()}
+        for stage in STAGES:
+            if f'{stage}_ns' not in columns:
+                cursor.execute(f'ALTER TABLE calculations ADD COLUMN {stage}_ns INTEGER')
+        migrated = 'parameters' in columns or interrupted
+        if migrated:
+            self._migrate_parameters(conn, renamed=interrupted)
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_sessions (
@@ -49,77 +184,688 @@ class DataManager:
             )
         ''')
         
+        self._create_indexes(cursor)
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'calculations_hourly'")
+        rollups_exist = cursor.fetchone() is not None
+
+        for table, key in (('calculations_hourly', 'bucket'), ('calculations_daily', 'day')):
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {key} TEXT NOT NULL,
+                    shape_type TEXT NOT NULL,
+                    shape_dimension TEXT NOT NULL,
+                    calculations INTEGER NOT NULL DEFAULT 0,
+                    time_sum REAL NOT NULL DEFAULT 0,
+                    time_count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY ({key}, shape_type, shape_dimension)
+                ) WITHOUT ROWID
+            ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS calculation_spans_hourly (
+                bucket TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                bin INTEGER NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (bucket, stage, bin)
+            ) WITHOUT ROWID
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS retention_state (
+                name TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID
+        ''')
+
+        if not rollups_exist or migrated:
+            self._rebuild_rollups(cursor)
+        
         conn.commit()
-        conn.close()
+        if migrated:
+            conn.execute('VACUUM')
+
+    def _migrate_parameters(self, conn, renamed=False):
+        # sqlite3 autocommits DDL, so the rename, copy and drop run in one explicit
+        # transaction; a failed copy rolls back to the original table.
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if renamed:
+                # A previous run stopped after the rename; rows logged since then keep
+                # their ids and the old rows are appended after them.
+                keep_ids = conn.execute('SELECT 1 FROM calculations LIMIT 1').fetchone() is None
+            else:
+                conn.execute('ALTER TABLE calculations RENAME TO calculations_json')
+                conn.execute(self.TABLE_SQL)
+                keep_ids = True
+            source = {row[1] for row in conn.execute('PRAGMA table_info(calculations_json)')}
+            conn.execute(f'''
+                INSERT INTO calculations ({'id, ' if keep_ids else ''}{', '.join(CALCULATION_COLUMNS)})
+                SELECT {'id, ' if keep_ids else ''}{', '.join(name if name in source else 'NULL'
+                                                              for name in CALCULATION_COLUMNS[:-len(PARAMETER_COLUMNS)])},
+                       {', '.join(f"CASE WHEN json_valid(parameters) THEN json_extract(parameters, '$.{name}') END"
+                                  for name in PARAMETER_COLUMNS)}
+                FROM calculations_json
+                ORDER BY id
+            ''')
+            conn.execute('DROP TABLE calculations_json')
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
     
+    def _create_indexes(self, cursor):
+        for name, column in self.INDEXES:
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON calculations ({column})')
+
+    def _timestamp(self):
+        second = int(time.time())
+        if second != self._timestamp_second:
+            self._timestamp_second = second
+            self._timestamp_text = datetime.fromtimestamp(second, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        return self._timestamp_text
+
+    def _write_rows(self, conn, rows):
+        # Many rows per INSERT: executemany runs the statement once per row, which
+        # cost more than binding the values.
+        for start in range(0, len(rows), ROWS_PER_INSERT):
+            chunk = rows[start:start + ROWS_PER_INSERT]
+            conn.execute(_insert_sql(len(chunk)), tuple(chain.from_iterable(chunk)))
+        hourly, spans = self._count_rollups(rows)
+        self._upsert_rollups(conn, hourly, spans)
+
+    @staticmethod
+    def _count_rollups(rows):
+        # Same aggregates as _update_rollups, counted from the rows in memory so a
+        # flush upserts one row per bucket instead of re-reading what it inserted.
+        hourly = {}
+        spans = Counter()
+        for row in rows:
+            timestamp = row[6]
+            if not isinstance(timestamp, str):
+                continue
+            bucket = timestamp[:13]
+            key = (bucket, row[0], row[1])
+            totals = hourly.get(key)
+            if totals is None:
+                totals = hourly[key] = [0, 0.0, 0]
+            totals[0] += 1
+            time_ms = row[5]
+            if time_ms and time_ms == time_ms:
+                totals[1] += time_ms
+                totals[2] += 1
+            for stage, ns in zip(STAGES, row[8:11]):
+                if ns is not None and ns == ns:
+                    spans[bucket, stage, _span_bin(ns)] += 1
+        return hourly, spans
+
+    def _upsert_rollups(self, conn, hourly, spans):
+        daily = {}
+        for (bucket, shape_type, dimension), (count, time_sum, time_count) in hourly.items():
+            totals = daily.setdefault((bucket[:10], shape_type, dimension), [0, 0.0, 0])
+            totals[0] += count
+            totals[1] += time_sum
+            totals[2] += time_count
+
+        for table, key, counts in (('calculations_hourly', 'bucket', hourly),
+                                   ('calculations_daily', 'day', daily)):
+            conn.executemany(f'''
+                INSERT INTO {table} ({key}, shape_type, shape_dimension, calculations, time_sum, time_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT ({key}, shape_type, shape_dimension) DO UPDATE SET
+                    calculations = calculations + excluded.calculations,
+                    time_sum = time_sum + excluded.time_sum,
+                    time_count = time_count + excluded.time_count
+            ''', [(*group, *totals) for group, totals in counts.items()])
+
+        conn.executemany('''
+            INSERT INTO calculation_spans_hourly (bucket, stage, bin, count) VALUES (?, ?, ?, ?)
+            ON CONFLICT (bucket, stage, bin) DO UPDATE SET count = count + excluded.count
+        ''', [(*group, count) for group, count in spans.items()])
+
+    def _update_rollups(self, conn, where, values):
+        _sql_functions(conn)
+        for table, key, length in (('calculations_hourly', 'bucket', 13), ('calculations_daily', 'day', 10)):
+            conn.execute(f'''
+                INSERT INTO {table} ({key}, shape_type, shape_dimension, calculations, time_sum, time_count)
+                SELECT substr(timestamp, 1, {length}), shape_type, shape_dimension, COUNT(*),
+                       COALESCE(SUM(NULLIF(calculation_time_ms, 0)), 0), COUNT(NULLIF(calculation_time_ms, 0))
+                FROM calculations
+                WHERE timestamp IS NOT NULL AND {where}
+                GROUP BY 1, 2, 3
+                ON CONFLICT ({key}, shape_type, shape_dimension) DO UPDATE SET
+                    calculations = calculations + excluded.calculations,
+                    time_sum = time_sum + excluded.time_sum,
+                    time_count = time_count + excluded.time_count
+            ''', values)
+
+        spans = ' UNION ALL '.join(f'''
+            SELECT substr(timestamp, 1, 13) AS bucket, '{stage}' AS stage,
+                   CAST(log2(max({stage}_ns, 1)) * {SPAN_BINS_PER_OCTAVE} AS INTEGER) AS bin
+            FROM calculations
+            WHERE timestamp IS NOT NULL AND {stage}_ns IS NOT NULL AND {where}
+        ''' for stage in STAGES)
+        conn.execute(f'''
+            INSERT INTO calculation_spans_hourly (bucket, stage, bin, count)
+            SELECT bucket, stage, bin, COUNT(*) FROM ({spans})
+            WHERE true
+            GROUP BY bucket, stage, bin
+            ON CONFLICT (bucket, stage, bin) DO UPDATE SET count = count + excluded.count
+        ''', values * len(STAGES))
+
+    def rebuild_rollups(self):
+        if self.buffered:
+            self.flush()
+
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            rows = self._rebuild_rollups(conn.cursor())
+        conn.close()
+        return rows
+
+    def _rebuild_rollups(self, cursor):
+        # Raw rows before the retention cutoff were archived or deleted, so the
+        # rollups for those days are kept and only the days after it are rebuilt.
+        cursor.execute('SELECT name, value FROM retention_state')
+        state = dict(cursor.fetchall())
+        since = state.get('raw', '')
+
+        cursor.execute('DELETE FROM calculations_hourly WHERE bucket >= ?', (since,))
+        cursor.execute('DELETE FROM calculations_daily WHERE day >= ?', (since,))
+        cursor.execute('DELETE FROM calculation_spans_hourly WHERE bucket >= ?', (since,))
+        self._update_rollups(cursor.connection, 'timestamp >= ?', (since,))
+
+        if 'hourly' in state:
+            cursor.execute('DELETE FROM calculations_hourly WHERE bucket < ?', (state['hourly'],))
+            cursor.execute('DELETE FROM calculation_spans_hourly WHERE bucket < ?', (state['hourly'],))
+
+        cursor.execute('SELECT COALESCE(SUM(calculations), 0) FROM calculations_hourly')
+        return cursor.fetchone()[0]
+
+    def make_row(self, shape_type, shape_dimension, parameters,
+                 result_area=None, result_perimeter=None, result_volume=None,
+                 calculation_time_ms=None, session_id="default",
+                 compute_ns=None, log_ns=None, render_ns=None):
+        if not PARAMETER_SET.issuperset(parameters):
+            unknown = parameters.keys() - PARAMETER_SET
+            raise ValueError(f"Parametri necunoscuti: {', '.join(sorted(unknown))}")
+        return (shape_type, shape_dimension,
+                NULL if result_area is None else result_area,
+                NULL if result_perimeter is None else result_perimeter,
+                NULL if result_volume is None else result_volume,
+                NULL if calculation_time_ms is None else calculation_time_ms,
+                self._timestamp(), session_id,
+                NULL if compute_ns is None else compute_ns,
+                NULL if log_ns is None else log_ns,
+                NULL if render_ns is None else render_ns,
+                *map(parameters.get, PARAMETER_COLUMNS, _NULL_PARAMETERS))
+
     def log_calculation(self, shape_type, shape_dimension, parameters, 
                        result_area=None, result_perimeter=None, result_volume=None,
-                       calculation_time_ms=None, session_id="default"):
+                       calculation_time_ms=None, session_id="default",
+                       compute_ns=None, log_ns=None, render_ns=None):
+        row = self.make_row(shape_type, shape_dimension, parameters, result_area,
+                            result_perimeter, result_volume, calculation_time_ms, session_id,
+                            compute_ns, log_ns, render_ns)
+        
+        if not self.buffered:
+            self.write_rows([row])
+            return
+        
+        with self._lock:
+            self._buffer.append(row)
+            if (len(self._buffer) >= self.flush_rows
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def write_rows(self, rows):
+        if not self.buffered:
+            conn = sqlite3.connect(self.db_path)
+            with conn:
+                self._write_rows(conn, rows)
+            conn.close()
+            return
+
+        with self._lock:
+            self._buffer.extend(rows)
+            self._flush_locked()
+
+    def bulk_load(self, chunks):
+        if self.buffered:
+            self.flush()
+
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO calculations 
-            (shape_type, shape_dimension, parameters, result_area, result_perimeter, 
-             result_volume, calculation_time_ms, session_id)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (shape_type, shape_dimension, json.dumps(parameters), 
-              result_area, result_perimeter, result_volume, calculation_time_ms, session_id))
-        
-        conn.commit()
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.execute('PRAGMA cache_size=-262144')
+        rows = 0
+        try:
+            with conn:
+                for name, _ in self.INDEXES:
+                    conn.execute(f'DROP INDEX IF EXISTS {name}')
+            for chunk in chunks:
+                with conn:
+                    self._write_rows(conn, chunk)
+                rows += len(chunk)
+        finally:
+            with conn:
+                self._create_indexes(conn.cursor())
+                conn.execute('ANALYZE')
+            conn.close()
+        return rows
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer or self._conn is None:
+            return
+        rows, self._buffer = self._buffer, []
+        with self._conn:
+            self._write_rows(self._conn, rows)
+
+    def _flush_periodically(self):
+        # Rows logged just before a pause are written after flush_interval instead
+        # of waiting for the next log_calculation call.
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._conn is None:
+                    return
+                if time.monotonic() - self._last_flush < self.flush_interval:
+                    continue
+                try:
+                    self._flush_locked()
+                except sqlite3.OperationalError:
+                    continue
+
+    def close(self):
+        with self._lock:
+            if self._conn is None:
+                return
+            self._flush_locked()
+            self._conn.close()
+            self._conn = None
+        if self.flush_interval:
+            self._closed.set()
+        atexit.unregister(self.close)
+    
+    def partition_path(self, month):
+        root, ext = os.path.splitext(self.db_path)
+        return f"{root}-{month}{ext or '.db'}"
+
+    def partition_paths(self):
+        root, ext = os.path.splitext(self.db_path)
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        prefix = os.path.basename(root) + '-'
+        suffix = ext or '.db'
+        paths = []
+        for name in sorted(os.listdir(directory)):
+            month = name[len(prefix):-len(suffix)]
+            if (name.startswith(prefix) and name.endswith(suffix)
+                    and len(month) == 7 and month[4] == '-' and month.replace('-', '').isdigit()):
+                paths.append(os.path.join(directory, name))
+        return paths
+
+    def apply_retention(self, retention_days=None, archive=None, hourly_days=None, batch_rows=10000):
+        retention_days = self.retention_days if retention_days is None else retention_days
+        archive = self.archive if archive is None else archive
+        hourly_days = self.hourly_days if hourly_days is None else hourly_days
+        if self.buffered:
+            self.flush()
+
+        result = {'archived': 0, 'deleted': 0, 'partitions': []}
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if retention_days is not None:
+                # Whole days only, so every day in calculations_daily is either fully
+                # raw or fully archived and rebuild_rollups can tell them apart.
+                day = (datetime.now(timezone.utc) - timedelta(days=retention_days)).strftime('%Y-%m-%d')
+                cutoff = f'{day} 00:00:00'
+                months = [month for month, in conn.execute('''
+                    SELECT DISTINCT substr(timestamp, 1, 7) FROM calculations WHERE timestamp < ?
+                ''', (cutoff,))]
+
+                columns = ', '.join(CALCULATION_COLUMNS)
+                for month in months:
+                    upper = min(cutoff, self._next_month(month) + ' 00:00:00')
+                    if archive:
+                        path = self.partition_path(month)
+                        self._create_partition(path)
+                        conn.execute('ATTACH DATABASE ? AS archive', (path,))
+                        result['partitions'].append(path)
+                    try:
+                        while True:
+                            with conn:
+                                ids = [row[0] for row in conn.execute('''
+                                    SELECT id FROM calculations
+                                    WHERE timestamp >= ? AND timestamp < ?
+                                    LIMIT ?
+                                ''', (month, upper, batch_rows))]
+                                if not ids:
+                                    break
+                                marks = ', '.join('?' * len(ids))
+                                if archive:
+                                    conn.execute(f'''
+                                        INSERT OR IGNORE INTO archive.calculations (id, {columns})
+                                        SELECT id, {columns} FROM main.calculations WHERE id IN ({marks})
+                                    ''', ids)
+                                    result['archived'] += len(ids)
+                                conn.execute(f'DELETE FROM main.calculations WHERE id IN ({marks})', ids)
+                                result['deleted'] += len(ids)
+                    finally:
+                        if archive:
+                            conn.execute('DETACH DATABASE archive')
+                with conn:
+                    self._record_retention(conn, 'raw', day)
+
+            if hourly_days is not None:
+                bucket = (datetime.now(timezone.utc) - timedelta(days=hourly_days)).strftime('%Y-%m-%d %H')
+                with conn:
+                    conn.execute('DELETE FROM calculations_hourly WHERE bucket < ?', (bucket,))
+                    conn.execute('DELETE FROM calculation_spans_hourly WHERE bucket < ?', (bucket,))
+                    self._record_retention(conn, 'hourly', bucket)
+        finally:
+            conn.close()
+        return result
+
+    @staticmethod
+    def _record_retention(conn, name, value):
+        conn.execute('''
+            INSERT INTO retention_state (name, value) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET value = max(value, excluded.value)
+        ''', (name, value))
+
+    @staticmethod
+    def _next_month(month):
+        year, number = int(month[:4]), int(month[5:7])
+        return f'{year + number // 12:04d}-{number % 12 + 1:02d}-01'
+
+    def _create_partition(self, path):
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute(self.TABLE_SQL)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_calculations_timestamp ON calculations (timestamp)')
+        conn.close()
+
+    def incremental_vacuum(self, pages=1000):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+                return None
+            conn.executescript(f'PRAGMA incremental_vacuum({int(pages)});')
+            return conn.execute('PRAGMA freelist_count').fetchone()[0]
+        finally:
+            conn.close()
+
+    def vacuum(self):
+        if self.buffered:
+            self.flush()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        conn.execute('VACUUM')
         conn.close()
+
+    def maintain(self, vacuum_pages=1000):
+        result = self.apply_retention()
+        result['free_pages'] = self.incremental_vacuum(vacuum_pages)
+        return result
     
     def get_statistics(self, days=7):
+        if self.buffered:
+            self.flush()
+
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        window = f'-{int(days)} days'
+
+        cursor.execute('''
+            SELECT bucket, shape_type, shape_dimension, calculations, time_sum, time_count
+            FROM calculations_hourly
+            WHERE bucket >= strftime('%Y-%m-%d %H', 'now', ?)
+        ''', (window,))
+        groups = cursor.fetchall()
+
+        if not groups:
+            conn.close()
+            return self._empty_stats()
         
         cursor.execute('''
-            SELECT * FROM calculations 
-            WHERE timestamp >= datetime('now', '-{} days')
+            SELECT id, shape_type, shape_dimension, result_area, result_perimeter,
+                   result_volume, calculation_time_ms, timestamp, session_id
+            FROM calculations
+            WHERE timestamp >= datetime('now', ?)
             ORDER BY timestamp DESC
-        '''.format(days))
-        
-        data = cursor.fetchall()
+            LIMIT 10
+        ''', (window,))
+        recent = cursor.fetchall()
+
+        cursor.execute('''
+            SELECT day, SUM(calculations)
+            FROM calculations_daily
+            WHERE day >= date('now', ?)
+            GROUP BY day
+        ''', (window,))
+        daily = cursor.fetchall()
+
+        cursor.execute('''
+            SELECT stage, bin, SUM(count)
+            FROM calculation_spans_hourly
+            WHERE bucket >= strftime('%Y-%m-%d %H', 'now', ?)
+            GROUP BY stage, bin
+        ''', (window,))
+        spans = cursor.fetchall()
         conn.close()
         
-        if not data:
-            return self._empty_stats()
+        return self._stats_from_groups(groups, recent, daily, spans)
+
+    def iter_calculations(self, session_id=None, shape_type=None, start=None, end=None,
+                          batch_rows=10000, archived=True):
+        if self.buffered:
+            self.flush()
+
+        conditions, values = [], []
+        for column, operator, value in (('session_id', '=', session_id), ('shape_type', '=', shape_type),
+                                        ('timestamp', '>=', start), ('timestamp', '<', end)):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                values.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        paths = []
+        if archived:
+            for path in self.partition_paths():
+                month = os.path.splitext(path)[0][-7:]
+                if (start is None or month >= start[:7]) and (end is None or month <= end[:7]):
+                    paths.append(path)
+        paths.append(self.db_path)
+
+        for path in paths:
+            conn = self._connect(path)
+            try:
+                sql = f'SELECT id, {self._select_columns(conn)} FROM calculations{where} ORDER BY timestamp, id'
+                cursor = conn.execute(sql, values)
+                while True:
+                    rows = cursor.fetchmany(batch_rows)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                conn.close()
+
+    def _connect(self, path=None):
+        path = path or self.db_path
+        if self.read_only:
+            from pathlib import Path
+            return sqlite3.connect(f'{Path(path).absolute().as_uri()}?mode=ro', uri=True)
+        return sqlite3.connect(path)
+
+    @staticmethod
+    def _select_columns(conn):
+        # A read-only connection cannot migrate, so older layouts are read as they are.
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(calculations)')}
+        legacy = 'parameters' in columns
+        return ', '.join(
+            name if name in columns
+            else f"CASE WHEN json_valid(parameters) THEN json_extract(parameters, '$.{name}') END AS {name}"
+            if legacy and name in PARAMETER_SET
+            else f'NULL AS {name}'
+            for name in CALCULATION_COLUMNS)
+
+    HISTORY_COLUMNS = 'id, shape_type, timestamp, result_area, result_volume'
+
+    @staticmethod
+    def history_key(row):
+        return row[2], row[0]
+
+    def history_page(self, before=None, limit=100, archived=True):
+        if self.buffered:
+            self.flush()
+
+        paths = [self.db_path]
+        if archived:
+            paths += [path for path in reversed(self.partition_paths())
+                      if before is None or os.path.splitext(path)[0][-7:] <= before[0][:7]]
+
+        rows = []
+        for path in paths:
+            conn = sqlite3.connect(path)
+            try:
+                if before is None:
+                    cursor = conn.execute(f'''
+                        SELECT {self.HISTORY_COLUMNS} FROM calculations
+                        ORDER BY timestamp DESC, id DESC LIMIT ?
+                    ''', (limit - len(rows),))
+                else:
+                    cursor = conn.execute(f'''
+                        SELECT {self.HISTORY_COLUMNS} FROM calculations
+                        WHERE (timestamp, id) < (?, ?)
+                        ORDER BY timestamp DESC, id DESC LIMIT ?
+                    ''', (*before, limit - len(rows)))
+                rows += cursor.fetchall()
+            finally:
+                conn.close()
+            if len(rows) >= limit:
+                break
+            if rows:
+                before = self.history_key(rows[-1])
+        return rows
+
+    def history_newer(self, after, limit=100, archived=True):
+        if self.buffered:
+            self.flush()
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cutoff = conn.execute("SELECT value FROM retention_state WHERE name = 'raw'").fetchone()
+        finally:
+            conn.close()
+
+        paths = []
+        if archived and (cutoff is None or after[0] < cutoff[0]):
+            paths = [path for path in self.partition_paths()
+                     if os.path.splitext(path)[0][-7:] >= after[0][:7]]
+        paths.append(self.db_path)
+
+        rows = []
+        for path in paths:
+            conn = sqlite3.connect(path)
+            try:
+                rows += conn.execute(f'''
+                    SELECT {self.HISTORY_COLUMNS} FROM calculations
+                    WHERE (timestamp, id) > (?, ?)
+                    ORDER BY timestamp ASC, id ASC LIMIT ?
+                ''', (*after, limit - len(rows))).fetchall()
+            finally:
+                conn.close()
+            if len(rows) >= limit:
+                break
+            if rows:
+                after = self.history_key(rows[-1])
+        return rows[::-1]
+
+    def parameter_statistics(self, shape_type, days=7, **ranges):
+        unknown = ranges.keys() - PARAMETER_SET
+        if unknown:
+            raise ValueError(f"Parametri necunoscuti: {', '.join(sorted(unknown))}")
+        if self.buffered:
+            self.flush()
+
+        conditions = ['shape_type = ?', "timestamp >= datetime('now', ?)"]
+        values = [shape_type, f'-{int(days)} days']
+        for name, (low, high) in ranges.items():
+            conditions.append(f'{name} BETWEEN ? AND ?')
+            values.extend((low, high))
+
+        columns = PARAMETER_COLUMNS + ('result_area', 'result_perimeter', 'result_volume')
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute(f'''
+            SELECT {', '.join(f'COUNT({c}), MIN({c}), AVG({c}), MAX({c})' for c in columns)}
+            FROM calculations
+            WHERE {' AND '.join(conditions)}
+        ''', values).fetchone()
+        conn.close()
+
+        return {
+            column: dict(zip(('count', 'min', 'avg', 'max'), row[4 * i:4 * i + 4]))
+            for i, column in enumerate(columns) if row[4 * i]
+        }
         
+    @staticmethod
+    def stage_percentiles(spans, percentiles=(50, 90, 99)):
+        histograms = defaultdict(list)
+        for stage, span_bin, count in sorted(spans):
+            histograms[stage].append((span_bin, count))
+
+        result = {}
+        for stage, histogram in histograms.items():
+            total = sum(count for _, count in histogram)
+            values = {'count': total}
+            for p in percentiles:
+                target = total * p / 100
+                seen = 0
+                for span_bin, count in histogram:
+                    seen += count
+                    if seen >= target:
+                        break
+                values[f'p{p}'] = _span_ms(span_bin)
+            result[stage] = values
+        return result
+
+    def _stats_from_groups(self, groups, recent, daily=None, spans=()):
         stats = {
-            'total_calculations': len(data),
+            'total_calculations': 0,
             'shapes_frequency': defaultdict(int),
             'dimensions_frequency': defaultdict(int),
             'calculations_by_hour': defaultdict(int),
             'calculations_by_day': defaultdict(int),
             'avg_calculation_time': 0,
+            'stage_percentiles': self.stage_percentiles(spans),
             'most_popular_shape': '',
-            'recent_calculations': data[:10]
+            'recent_calculations': recent
         }
         
         total_time = 0
         time_count = 0
         
-        for row in data:
-            shape_type = row[1]
-            shape_dimension = row[2]
-            calc_time = row[7]
-            timestamp = row[8]
+        for bucket, shape_type, shape_dimension, count, time_sum, time_rows in groups:
+            stats['total_calculations'] += count
+            stats['shapes_frequency'][shape_type] += count
+            stats['dimensions_frequency'][shape_dimension] += count
             
-            stats['shapes_frequency'][shape_type] += 1
-            stats['dimensions_frequency'][shape_dimension] += 1
+            if bucket:
+                stats['calculations_by_hour'][int(bucket[11:13])] += count
+                stats['calculations_by_day'][bucket[:10]] += count
             
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                hour = dt.hour
-                day = dt.strftime('%Y-%m-%d')
-                stats['calculations_by_hour'][hour] += 1
-                stats['calculations_by_day'][day] += 1
-            except:
-                pass
-            
-            if calc_time:
-                total_time += calc_time
-                time_count += 1
+            if time_rows:
+                total_time += time_sum
+                time_count += time_rows
+
+        if daily is not None:
+            stats['calculations_by_day'] = defaultdict(int, daily)
         
         if time_count > 0:
             stats['avg_calculation_time'] = total_time / time_count
@@ -130,6 +876,15 @@ class DataManager:
         
         return stats
     
+    def change_marker(self):
+        with self._lock:
+            pending = len(self._buffer)
+
+        conn = sqlite3.connect(self.db_path)
+        last_id = conn.execute('SELECT MAX(id) FROM calculations').fetchone()[0]
+        conn.close()
+        return last_id, pending
+
     def _empty_stats(self):
         return {
             'total_calculations': 0,
@@ -138,19 +893,968 @@ class DataManager:
             'calculations_by_hour': {},
             'calculations_by_day': {},
             'avg_calculation_time': 0,
+            'stage_percentiles': {},
             'most_popular_shape': 'N/A',
             'recent_calculations': []
         }
 
+class LogWriter:
+    POLICIES = ("block", "drop")
+
+    def __init__(self, data_manager, max_queue=10000, batch_rows=1000,
+                 policy="block", block_timeout=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Politica necunoscuta: {policy}")
+        self.data_manager = data_manager
+        self.batch_rows = batch_rows
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.max_depth = 0
+        self.flush_ms_total = 0.0
+        self.flush_ms_max = 0.0
+        self.flush_ms_last = 0.0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = object()
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log_calculation(self, shape_type, shape_dimension, parameters,
+                        result_area=None, result_perimeter=None, result_volume=None,
+                        calculation_time_ms=None, session_id="default",
+                        compute_ns=None, render_ns=None):
+        # log_ns is what logging costs the calling (Tk) thread: building the row and
+        # queueing it. The SQLite write happens later in _run and is reported per
+        # row by metrics() as write_us_per_row.
+        start = time.perf_counter_ns()
+        row = self.data_manager.make_row(
+            shape_type, shape_dimension, parameters, result_area, result_perimeter,
+            result_volume, calculation_time_ms, session_id, compute_ns, None, render_ns)
+        return self.enqueue(row[:9] + (time.perf_counter_ns() - start,) + row[10:])
+
+    def enqueue(self, row):
+        try:
+            if self.policy == "block":
+                self._queue.put(row, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _run(self):
+        while True:
+            row = self._queue.get()
+            if row is self._stop:
+                self._queue.task_done()
+                return
+
+            batch = [row]
+            stop = False
+            while len(batch) < self.batch_rows:
+                try:
+                    row = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is self._stop:
+                    stop = True
+                    break
+                batch.append(row)
+
+            start = time.perf_counter()
+            try:
+                self.data_manager.write_rows(batch)
+                self.written += len(batch)
+            except sqlite3.Error:
+                self.failed += len(batch)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            self.batches += 1
+            self.flush_ms_last = elapsed
+            self.flush_ms_total += elapsed
+            self.flush_ms_max = max(self.flush_ms_max, elapsed)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(self._stop)
+            self._thread.join()
+        atexit.unregister(self.close)
+
+    def metrics(self):
+        return {
+            'depth': self._queue.qsize(),
+            'max_depth': self.max_depth,
+            'capacity': self._queue.maxsize,
+            'policy': self.policy,
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'batches': self.batches,
+            'flush_ms_last': self.flush_ms_last,
+            'flush_ms_avg': self.flush_ms_total / self.batches if self.batches else 0.0,
+            'flush_ms_max': self.flush_ms_max,
+            'write_us_per_row': self.flush_ms_total * 1000 / (self.written + self.failed)
+                                if self.written + self.failed else 0.0,
+        }
+
+
+class _StageTimer:
+    __slots__ = ('profiler', 'stage', 'start')
+
+    def __init__(self, profiler, stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.stage, time.perf_counter_ns() - self.start)
+
+
+class StageProfiler:
+    STAGES = ('parse', 'formula', 'log', 'clear_frame', 'figure', 'canvas_draw')
+    ENV_VAR = 'GEOMETRY_PROFILE'
+    DEFAULT_OUTPUT = 'geometry_profile.prof'
+
+    _disabled = nullcontext()
+
+    def __init__(self, enabled=False, output=None):
+        self.enabled = enabled
+        self.output = output
+        self._totals = {}
+        self._profile = None
+        if enabled and output:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if enabled:
+            atexit.register(self.close)
+
+    @classmethod
+    def from_environment(cls, output=None):
+        if output is None:
+            output = os.environ.get(cls.ENV_VAR) or None
+        if output is None:
+            return cls()
+        if output in ('1', 'true', 'yes'):
+            output = cls.DEFAULT_OUTPUT
+        return cls(enabled=True, output=output)
+
+    def stage(self, name):
+        if not self.enabled:
+            return self._disabled
+        return _StageTimer(self, name)
+
+    def record(self, stage, ns):
+        totals = self._totals.get(stage)
+        if totals is None:
+            totals = self._totals[stage] = [0, 0, 0]
+        totals[0] += 1
+        totals[1] += ns
+        if ns > totals[2]:
+            totals[2] = ns
+
+    def stats(self):
+        return {
+            stage: {
+                'count': count,
+                'total_ms': total / 1e6,
+                'avg_ms': total / count / 1e6,
+                'max_ms': worst / 1e6,
+            }
+            for stage, (count, total, worst) in self._totals.items()
+        }
+
+    def close(self):
+        atexit.unregister(self.close)
+        if not self.enabled:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.output)
+            self._profile = None
+            print(f"Profil cProfile salvat in {self.output} "
+                  f"(flamegraph: flameprof/snakeviz {self.output})", file=sys.stderr)
+        for stage, values in sorted(self.stats().items(), key=lambda item: -item[1]['total_ms']):
+            print(f"{stage:12s} {values['count']:6d} x  medie {values['avg_ms']:8.3f} ms  "
+                  f"max {values['max_ms']:8.3f} ms  total {values['total_ms']:9.1f} ms",
+                  file=sys.stderr)
+        self.enabled = False
+
+
+class DashboardCharts:
+    PIE_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
+
+    def __init__(self, figure):
+        _load_matplotlib()
+        self.figure = figure
+        self.ax_shapes = figure.add_subplot(221)
+        self.ax_dimensions = figure.add_subplot(222)
+        self.ax_hours = figure.add_subplot(223)
+        self.ax_days = figure.add_subplot(224)
+
+        self._shown = {}
+        self._pie = None
+        self._dimension_bars = None
+        self._dimension_labels = []
+        self._hour_line = None
+        self._day_bars = None
+        self._extents = None
+        self._canvas_size = None
+        self._background = patches.Rectangle((0, 0), 1, 1, transform=IdentityTransform(),
+                                             facecolor=figure.get_facecolor(), edgecolor='none')
+        self._background.set_figure(figure)
+
+        for ax in (self.ax_shapes, self.ax_dimensions, self.ax_hours, self.ax_days):
+            ax.set_visible(False)
+
+    def update(self, stats):
+        shapes = tuple(stats['shapes_frequency'].items())
+        dimensions = tuple(stats['dimensions_frequency'].items())
+        hours = tuple(sorted(stats['calculations_by_hour'].items()))
+        days = tuple(sorted(stats['calculations_by_day'].items())[-7:])
+
+        panels = (
+            ('shapes', self.ax_shapes, shapes, self._update_shapes),
+            ('dimensions', self.ax_dimensions, dimensions, self._update_dimensions),
+            ('hours', self.ax_hours, hours, self._update_hours),
+            ('days', self.ax_days, days, self._update_days),
+        )
+
+        changed = []
+        relayout = False
+        for name, ax, data, update_panel in panels:
+            if self._shown.get(name) == data:
+                continue
+            changed.append(ax)
+            self._shown[name] = data
+            if ax.get_visible() != bool(data):
+                ax.set_visible(bool(data))
+                relayout = True
+            if data:
+                relayout = update_panel(data) or relayout
+
+        if relayout:
+            self.figure.tight_layout()
+            self._extents = None
+        return changed
+
+    def _extent(self, ax, renderer):
+        return Bbox.intersection(ax.get_tightbbox(renderer).padded(2), self.figure.bbox)
+
+    def redraw(self, canvas, axes):
+        # A full draw of the 12x8 figure takes ~140 ms, so when only some panels
+        # changed they are repainted over their old and new extent (titles, tick
+        # and pie labels included) and blitted. A new layout or a resized canvas
+        # needs the whole figure, and so does a refresh that changed every panel,
+        # where the full draw is the cheaper path.
+        if not axes:
+            return
+        size = canvas.get_width_height()
+        visible = [ax for ax in self.figure.axes if ax.get_visible()]
+        if self._extents is None or size != self._canvas_size or len(axes) >= len(visible):
+            canvas.draw()
+            self._canvas_size = size
+            self._extents = {}
+            return
+
+        renderer = canvas.get_renderer()
+        for ax in visible:
+            if ax not in self._extents:
+                self._extents[ax] = self._extent(ax, renderer)
+        dirty = {}
+        pending = list(axes)
+        while pending:
+            ax = pending.pop()
+            extent = self._extent(ax, renderer) if ax in axes else self._extents[ax]
+            dirty[ax] = Bbox.union([self._extents[ax], extent])
+            self._extents[ax] = extent
+            # Longer tick labels or a moved pie label can reach into a neighbouring
+            # panel; that panel is repainted too.
+            pending += [other for other in visible
+                        if other not in dirty and other not in pending
+                        and self._extents[other].overlaps(dirty[ax])]
+
+        for bbox in dirty.values():
+            self._background.set_bounds(bbox.x0, bbox.y0, bbox.width, bbox.height)
+            self.figure.draw_artist(self._background)
+        for ax in dirty:
+            self.figure.draw_artist(ax)
+        for bbox in dirty.values():
+            canvas.blit(bbox)
+
+    def _update_shapes(self, data):
+        shapes = [shape for shape, _ in data]
+        counts = [count for _, count in data]
+
+        if self._pie is None or self._pie[0] != shapes:
+            self.ax_shapes.clear()
+            wedges, labels, percents = self.ax_shapes.pie(counts, labels=shapes, autopct='%1.1f%%',
+                                                          colors=self.PIE_COLORS[:len(shapes)])
+            self.ax_shapes.set_title('Distributia Formelor Geometrice')
+            self._pie = (shapes, wedges, labels, percents)
+            return True
+
+        _, wedges, labels, percents = self._pie
+        total = sum(counts)
+        theta = 0
+        for wedge, label, percent, count in zip(wedges, labels, percents, counts):
+            span = 360 * count / total
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+
+            middle = math.radians(theta + span / 2)
+            x, y = math.cos(middle), math.sin(middle)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            percent.set_position((0.6 * x, 0.6 * y))
+            percent.set_text(f'{100 * count / total:.1f}%')
+            theta += span
+        return False
+
+    def _update_bars(self, ax, current, data, build):
+        labels = [label for label, _ in data]
+        counts = [count for _, count in data]
+
+        if current is None or current[0] != labels:
+            ax.clear()
+            bars = build(ax, labels, counts)
+            return (labels, bars), True
+
+        for bar, count in zip(current[1], counts):
+            bar.set_height(count)
+        ax.relim()
+        ax.autoscale_view()
+        return current, False
+
+    def _update_dimensions(self, data):
+        def build(ax, dimensions, counts):
+            bars = ax.bar(dimensions, counts, color=['#3498db', '#e74c3c'])
+            ax.set_title('Calcule 2D vs 3D')
+            ax.set_ylabel('Numarul de calcule')
+            self._dimension_labels = [
+                ax.text(bar.get_x() + bar.get_width()/2., bar.get_height(),
+                        f'{int(bar.get_height())}', ha='center', va='bottom')
+                for bar in bars
+            ]
+            return bars
+
+        self._dimension_bars, rebuilt = self._update_bars(self.ax_dimensions, self._dimension_bars, data, build)
+        if not rebuilt:
+            for bar, text in zip(self._dimension_bars[1], self._dimension_labels):
+                text.set_position((bar.get_x() + bar.get_width()/2., bar.get_height()))
+                text.set_text(f'{int(bar.get_height())}')
+        return rebuilt
+
+    def _update_hours(self, data):
+        hours = [hour for hour, _ in data]
+        counts = [count for _, count in data]
+
+        if self._hour_line is None:
+            self._hour_line, = self.ax_hours.plot(hours, counts, marker='o', linewidth=2,
+                                                  markersize=6, color='#2ecc71')
+            self.ax_hours.set_title('Activitate pe Ore')
+            self.ax_hours.set_xlabel('Ora zilei')
+            self.ax_hours.set_ylabel('Numarul de calcule')
+            self.ax_hours.grid(True, alpha=0.3)
+            return True
+
+        self._hour_line.set_data(hours, counts)
+        self.ax_hours.relim()
+        self.ax_hours.autoscale_view()
+        return False
+
+    def _update_days(self, data):
+        data = [(d.split('-')[2] + '/' + d.split('-')[1], count) for d, count in data]
+
+        def build(ax, day_labels, counts):
+            bars = ax.bar(day_labels, counts, color='#9b59b6')
+            ax.set_title('Trend Ultimele 7 Zile')
+            ax.set_xlabel('Data')
+            ax.set_ylabel('Calcule')
+            for label in ax.xaxis.get_majorticklabels():
+                label.set_rotation(45)
+            return bars
+
+        self._day_bars, rebuilt = self._update_bars(self.ax_days, self._day_bars, data, build)
+        return rebuilt
+
+class HistoryView:
+    def __init__(self, tree, scrollbar, data_manager, page_rows=100, max_rows=300):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.data_manager = data_manager
+        self.page_rows = page_rows
+        self.max_rows = max_rows
+        self.at_head = True
+        self.at_tail = False
+        self._loading = False
+        self._keys = {}
+        self._pages = queue.Queue()
+        tree.configure(yscrollcommand=self._on_scroll)
+
+    @staticmethod
+    def format_row(row):
+        _, shape_type, timestamp, result_area, result_volume = row
+        try:
+            time_str = datetime.fromisoformat(timestamp).strftime('%d/%m %H:%M')
+        except (TypeError, ValueError):
+            time_str = 'N/A'
+
+        if (result_volume or 0) > 0:
+            result_str = f"V: {result_volume:.2f}"
+        else:
+            result_str = f"A: {result_area or 0:.2f}"
+        return shape_type, time_str, result_str
+
+    def _insert(self, rows, index):
+        for offset, row in enumerate(rows):
+            position = index if index == 'end' else index + offset
+            iid = str(row[0])
+            self._keys[iid] = DataManager.history_key(row)
+            self.tree.insert('', position, iid=iid, values=self.format_row(row))
+
+    def _delete(self, items):
+        for iid in items:
+            del self._keys[iid]
+        self.tree.delete(*items)
+
+    # head_key runs on the Tk thread and fetch_refresh on the dashboard worker, so
+    # the refresh reads SQLite off the Tk thread; apply_refresh drops the rows if
+    # the window moved in the meantime.
+    def head_key(self):
+        if not self.at_head:
+            return False
+        children = self.tree.get_children()
+        return self._keys[children[0]] if children else None
+
+    def fetch_refresh(self, head):
+        if head is False:
+            return None
+        if head is not None:
+            rows = self.data_manager.history_newer(head, limit=self.page_rows)
+            if len(rows) < self.page_rows:
+                return head, False, rows
+        return head, True, self.data_manager.history_page(limit=self.page_rows)
+
+    def apply_refresh(self, result):
+        if result is None:
+            return
+        head, reload, rows = result
+        if head != self.head_key():
+            return
+
+        if reload:
+            self._delete(self.tree.get_children())
+            self._insert(rows, 'end')
+            self.at_tail = len(rows) < self.page_rows
+        else:
+            self._insert(rows, 0)
+            self._trim_tail()
+
+    def _trim_tail(self):
+        children = self.tree.get_children()
+        if len(children) > self.max_rows:
+            self._delete(children[self.max_rows:])
+            self.at_tail = False
+
+    def _trim_head(self):
+        children = self.tree.get_children()
+        extra = len(children) - self.max_rows
+        if extra > 0:
+            self._delete(children[:extra])
+            self.tree.yview_scroll(-extra, 'units')
+            self.at_head = False
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self._loading:
+            return
+        if ((float(last) >= 0.9 and not self.at_tail)
+                or (float(first) <= 0.1 and not self.at_head)):
+            self._loading = True
+            self.tree.after_idle(self._load_more)
+
+    def _load_more(self):
+        children = self.tree.get_children()
+        first, last = self.tree.yview()
+        if children and last >= 0.9 and not self.at_tail:
+            older, key = True, self._keys[children[-1]]
+        elif children and first <= 0.1 and not self.at_head:
+            older, key = False, self._keys[children[0]]
+        else:
+            self._loading = False
+            return
+
+        threading.Thread(target=self._fetch_page, args=(older, key), daemon=True).start()
+        self.tree.after(20, self._poll_page)
+
+    def _fetch_page(self, older, key):
+        try:
+            if older:
+                rows = self.data_manager.history_page(before=key, limit=self.page_rows)
+            else:
+                rows = self.data_manager.history_newer(key, limit=self.page_rows)
+        except sqlite3.Error:
+            rows = None
+        self._pages.put((older, key, rows))
+
+    def _poll_page(self):
+        try:
+            older, key, rows = self._pages.get_nowait()
+        except queue.Empty:
+            self.tree.after(20, self._poll_page)
+            return
+
+        self._loading = False
+        children = self.tree.get_children()
+        if rows is None or not children:
+            return
+        if older and self._keys[children[-1]] == key:
+            self._insert(rows, 'end')
+            self.at_tail = len(rows) < self.page_rows
+            self._trim_head()
+        elif not older and self._keys[children[0]] == key:
+            self._insert(rows, 0)
+            self.tree.yview_scroll(len(rows), 'units')
+            self.at_head = len(rows) < self.page_rows
+            self._trim_tail()
+
+class ShapeView2D:
+    def __init__(self, figure):
+        _load_matplotlib()
+        self.figure = figure
+        self.ax = figure.add_subplot(111)
+        self.ax.set_aspect('equal')
+        self.ax.grid(True, alpha=0.3)
+        self.canvas = None
+        self.shown = None
+        self._background = None
+        self._background_key = None
+
+        self.rectangle = patches.Rectangle((0, 0), 1, 1, fill=False, linewidth=2)
+        self.circle = patches.Circle((0, 0), 1, fill=False, color='red', linewidth=2)
+        self.triangle = patches.Polygon([[0, 0], [1, 0], [0.5, 1]], fill=False,
+                                        color='purple', linewidth=2)
+        for patch in (self.rectangle, self.circle, self.triangle):
+            self.ax.add_patch(patch)
+        self.radius_line, = self.ax.plot([], [], 'r--', linewidth=1)
+        self.points, = self.ax.plot([], [], 'o', markersize=5)
+
+        self.shapes = (self.rectangle, self.circle, self.triangle, self.radius_line, self.points)
+        for artist in self.shapes + (self.ax.title,):
+            artist.set_animated(True)
+        self.clear()
+
+    def attach(self, canvas):
+        self.canvas = canvas
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def clear(self):
+        for artist in self.shapes:
+            artist.set_visible(False)
+        self.ax.set_visible(False)
+        self.shown = None
+
+    def _show(self, artists, xlim, ylim, title):
+        for artist in self.shapes:
+            artist.set_visible(artist in artists)
+        self.ax.set_visible(True)
+        self.ax.set_xlim(*xlim)
+        self.ax.set_ylim(*ylim)
+        self.ax.set_title(title)
+
+    def draw_rectangle(self, lungime, latime, color='blue', title=None):
+        x = -lungime / 2
+        y = -latime / 2
+
+        self.rectangle.set_bounds(x, y, lungime, latime)
+        self.rectangle.set_color(color)
+
+        spatiu = max(lungime, latime) * 0.3
+        self._show((self.rectangle,),
+                   (x - spatiu, x + lungime + spatiu),
+                   (y - spatiu, y + latime + spatiu),
+                   title or f'Dreptunghi {lungime}x{latime}')
+
+    def draw_square(self, latura):
+        self.draw_rectangle(latura, latura, color='green', title=f'Patrat cu latura {latura}')
+
+    def draw_circle(self, raza):
+        self.circle.set_radius(raza)
+        self.radius_line.set_data([0, raza], [0, 0])
+        self.points.set_data([0], [0])
+        self.points.set_color('red')
+
+        spatiu = raza * 0.3
+        self._show((self.circle, self.radius_line, self.points),
+                   (-raza - spatiu, raza + spatiu),
+                   (-raza - spatiu, raza + spatiu),
+                   f'Cerc cu raza {raza}')
+
+    def draw_triangle(self, a, b, c):
+        latura_medie = (a + b + c) / 3
+        inaltime = latura_medie * math.sqrt(3) / 2
+
+        punctul_A = [0, 0]
+        punctul_B = [latura_medie, 0]
+        punctul_C = [latura_medie/2, inaltime]
+
+        self.triangle.set_xy([punctul_A, punctul_B, punctul_C])
+        self.points.set_data([punctul_A[0], punctul_B[0], punctul_C[0]],
+                             [punctul_A[1], punctul_B[1], punctul_C[1]])
+        self.points.set_color('purple')
+
+        spatiu = latura_medie * 0.2
+        self._show((self.triangle, self.points),
+                   (-spatiu, latura_medie + spatiu),
+                   (-spatiu, inaltime + spatiu),
+                   f'Triunghi {a}-{b}-{c}')
+
+    def _key(self):
+        return (self.ax.get_visible(), self.ax.get_xlim(), self.ax.get_ylim(),
+                tuple(self.figure.bbox.bounds))
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._background_key = self._key()
+        self._draw_animated()
+
+    def _draw_animated(self):
+        if not self.ax.get_visible():
+            return
+        for artist in self.shapes + (self.ax.title,):
+            if artist.get_visible():
+                self.ax.draw_artist(artist)
+
+    def render(self):
+        if self.canvas is None:
+            return
+        if self._background is None or self._background_key != self._key():
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.figure.bbox)
+
+class RenderCache:
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _size(image):
+        x0, y0, x1, y1 = image.get_extents()
+        return (x1 - x0) * (y1 - y0) * 4
+
+    def get(self, key):
+        image = self._entries.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key, image):
+        if key in self._entries:
+            self.bytes -= self._size(self._entries.pop(key))
+        size = self._size(image)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = image
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= self._size(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / requests if requests else 0.0,
+        }
+
+class ShapeView3D:
+    BOX_VERTICES = [
+        (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+        (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+    ]
+    BOX_FACES = [
+        (4, 5, 6, 7), (0, 1, 2, 3),
+        (3, 2, 6, 7), (0, 1, 5, 4),
+        (1, 2, 6, 5), (0, 3, 7, 4),
+    ]
+    BOX_COLORS = ['lightblue', 'lightblue', 'lightgreen', 'lightgreen', 'lightcoral', 'lightcoral']
+
+    _box_template = None
+    _unit_spheres = {}
+
+    def __init__(self, figure, max_triangles=4000, coarse_resolution=12, idle_delay_ms=250):
+        _load_mplot3d()
+        self.figure = figure
+        self.ax = figure.add_subplot(111, projection='3d')
+        self.max_triangles = max_triangles
+        self.coarse_resolution = coarse_resolution
+        self.idle_delay_ms = idle_delay_ms
+        self.canvas = None
+        self.shown = None
+        self.interactive = False
+        self._idle_timer = None
+        self._pending = None
+        self._artists = []
+        self._sphere = None
+        self._sphere_surface = None
+        self.clear()
+
+    def attach(self, canvas):
+        self.canvas = canvas
+        canvas.mpl_connect('button_press_event', self._start_interaction)
+        canvas.mpl_connect('button_release_event', self._end_interaction)
+        canvas.mpl_connect('resize_event', self._on_resize)
+        self._idle_timer = canvas.new_timer(interval=self.idle_delay_ms)
+        self._idle_timer.single_shot = True
+        self._idle_timer.add_callback(self._refine)
+
+    def clear(self):
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+        self._sphere = None
+        self._sphere_surface = None
+        self._pending = None
+        self.ax.set_visible(False)
+        self.shown = None
+
+    def render_key(self, key):
+        # Everything that decides the pixels, known before any artist is built: the
+        # shape, the sphere level of detail, the interaction state and the camera.
+        resolution = self.sphere_resolution() if key[0] == 'sfera' else None
+        size = self.canvas.get_width_height() if self.canvas is not None else None
+        return (key, resolution, self.interactive, self.ax.elev, self.ax.azim, self.ax.roll,
+                size, self.figure.dpi)
+
+    def show(self, key, method, *args):
+        getattr(self, method)(*args)
+        self.shown = key
+
+    def defer(self, key, method, *args):
+        # The canvas shows a cached bitmap of key; the artists still belong to the
+        # previous shape and are rebuilt only when something needs to redraw them.
+        self._pending = (method, args)
+        self.shown = key
+
+    def realize(self):
+        if self._pending is None:
+            return False
+        method, args = self._pending
+        self.show(self.shown, method, *args)
+        return True
+
+    @classmethod
+    def unit_sphere(cls, resolution):
+        mesh = cls._unit_spheres.get(resolution)
+        if mesh is None:
+            unghi_u = np.linspace(0, 2 * np.pi, resolution)
+            unghi_v = np.linspace(0, np.pi, resolution)
+            mesh = (np.outer(np.cos(unghi_u), np.sin(unghi_v)),
+                    np.outer(np.sin(unghi_u), np.sin(unghi_v)),
+                    np.outer(np.ones(resolution), np.cos(unghi_v)))
+            for axis in mesh:
+                axis.flags.writeable = False
+            cls._unit_spheres[resolution] = mesh
+        return mesh
+
+    def sphere_resolution(self):
+        if self.interactive:
+            resolution = self.coarse_resolution
+        elif self.canvas is None:
+            resolution = 30
+        else:
+            resolution = min(self.canvas.get_width_height()) // 16
+        cap = 1 + int(math.sqrt(self.max_triangles / 2))
+        return max(4, min(resolution, cap, 60))
+
+    def _set_sphere_mesh(self):
+        resolution = self.sphere_resolution()
+        if self._sphere_surface is not None:
+            if self._sphere_surface.resolution == resolution:
+                return False
+            self._sphere_surface.remove()
+            self._artists.remove(self._sphere_surface)
+
+        unit_x, unit_y, unit_z = self.unit_sphere(resolution)
+        raza = self._sphere
+        self._sphere_surface = self.ax.plot_surface(raza * unit_x, raza * unit_y, raza * unit_z,
+                                                    alpha=0.6, color='lightcoral')
+        self._sphere_surface.resolution = resolution
+        self._artists.append(self._sphere_surface)
+        return True
+
+    def _set_interactive(self, interactive):
+        self.interactive = interactive
+        rebuilt = self.realize()
+        if self._sphere is not None and self._set_sphere_mesh():
+            rebuilt = True
+        if rebuilt and self.canvas is not None:
+            self.canvas.draw_idle()
+
+    def _start_interaction(self, event):
+        if event.inaxes is self.ax:
+            self._idle_timer.stop()
+            self._set_interactive(True)
+
+    def _end_interaction(self, event):
+        if self.interactive:
+            self._idle_timer.start()
+
+    def _on_resize(self, event):
+        self.realize()
+        if self._sphere is None:
+            return
+        self.interactive = True
+        self._set_sphere_mesh()
+        self._idle_timer.start()
+
+    def _refine(self):
+        self._set_interactive(False)
+
+    def _begin(self):
+        self.clear()
+        self.ax.set_visible(True)
+
+    def _set_limits(self, xlim, ylim, zlim, title):
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+        self.ax.set_zlim(zlim)
+        self.ax.set_title(title)
+
+    def _add_polyhedron(self, fetele, culori, **kwargs):
+        poligon = Poly3DCollection(fetele, alpha=0.6, facecolors=culori, **kwargs)
+        self.ax.add_collection3d(poligon)
+        self._artists.append(poligon)
+        return poligon
+
+    @classmethod
+    def box_faces(cls, lungime, latime, inaltime):
+        if cls._box_template is None:
+            cls._box_template = np.asarray(cls.BOX_VERTICES, dtype=float)[np.asarray(cls.BOX_FACES)]
+        return cls._box_template * (lungime, latime, inaltime)
+
+    def draw_box(self, lungime, latime, inaltime):
+        self._add_polyhedron(self.box_faces(lungime, latime, inaltime), self.BOX_COLORS, shade=True)
+
+    def draw_cube(self, latura):
+        self._begin()
+        self.draw_box(latura, latura, latura)
+        self._set_limits([-latura, latura], [-latura, latura], [-latura, latura],
+                         f'Cub cu latura {latura}')
+
+    def draw_parallelepiped(self, lungime, latime, inaltime):
+        self._begin()
+        self.draw_box(lungime, latime, inaltime)
+
+        dim_max = max(lungime, latime, inaltime)
+        self._set_limits([-dim_max, dim_max], [-dim_max, dim_max], [-dim_max, dim_max],
+                         f'Paralelpiped {lungime}x{latime}x{inaltime}')
+
+    def draw_sphere(self, raza):
+        self._begin()
+        self._sphere = raza
+        self._set_sphere_mesh()
+        self._artists.append(self.ax.scatter([0], [0], [0], color='black', s=30))
+
+        self._set_limits([-raza*1.2, raza*1.2], [-raza*1.2, raza*1.2], [-raza*1.2, raza*1.2],
+                         f'Sfera cu raza {raza}')
+
+    def draw_prism(self, a, b, c, inaltime):
+        self._begin()
+
+        latura_medie = (a + b + c) / 3
+        inaltime_triunghi = latura_medie * math.sqrt(3) / 2
+
+        A_jos = [0, 0, -inaltime/2]
+        B_jos = [latura_medie, 0, -inaltime/2]
+        C_jos = [latura_medie/2, inaltime_triunghi, -inaltime/2]
+
+        A_sus = [0, 0, inaltime/2]
+        B_sus = [latura_medie, 0, inaltime/2]
+        C_sus = [latura_medie/2, inaltime_triunghi, inaltime/2]
+
+        fetele = [
+            [A_jos, B_jos, C_jos],
+            [A_sus, B_sus, C_sus],
+            [A_jos, A_sus, B_sus, B_jos],
+            [B_jos, B_sus, C_sus, C_jos],
+            [C_jos, C_sus, A_sus, A_jos]
+        ]
+
+        self._add_polyhedron(fetele, 'lightpink', edgecolor='black')
+
+        coordonata_maxima = max(latura_medie, inaltime_triunghi, inaltime)
+        self._set_limits([0-coordonata_maxima*0.2, latura_medie+coordonata_maxima*0.2],
+                         [0-coordonata_maxima*0.2, inaltime_triunghi+coordonata_maxima*0.2],
+                         [-inaltime/2-coordonata_maxima*0.2, inaltime/2+coordonata_maxima*0.2],
+                         f'Prisma triunghiulara\nBaza: {a}-{b}-{c}, Inaltime: {inaltime}')
+
 class CalculatorGeometrie:
-    def __init__(self, root):
+    MAINTENANCE_INTERVAL_MS = 10 * 60 * 1000
+
+    def __init__(self, root, profiler=None, retention_days=None):
+        _load_tkagg()
+        import geometry_engine
         self.root = root
         self.root.title("Calculator Geometrie - AI Analytics Platform")
         self.root.geometry("1200x800")
         self.root.configure(bg='#f0f0f0')
         
-        self.data_manager = DataManager()
+        self.data_manager = DataManager(buffered=True, flush_rows=100, retention_days=retention_days)
+        self.log_writer = LogWriter(self.data_manager)
+        self.result_cache = geometry_engine.ResultCache(db_path=self.data_manager.db_path)
+        self.render_cache = RenderCache()
+        self.profiler = profiler or StageProfiler()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.session_id = f"session_{int(time.time())}"
+
+        self._refresh_thread = None
+        self._refresh_pending = False
+        self._refresh_force = False
+        self._refresh_results = queue.Queue()
+        self._last_refresh_marker = None
+        self._last_refresh_time = 0
+        self._maintenance_thread = None
         
         style = ttk.Style()
         style.theme_use('clam')
@@ -171,14 +1875,76 @@ class CalculatorGeometrie:
         self.setup_dashboard_interface()
         
         self.setup_auto_refresh()
+        self.setup_maintenance()
+        
+    def on_close(self):
+        self.result_cache.save()
+        self.log_writer.close()
+        self.data_manager.close()
+        self.profiler.close()
+        self.root.destroy()
         
     def setup_auto_refresh(self):
         def refresh_dashboard():
             if self.notebook.index(self.notebook.select()) == 2:
-                self.update_dashboard()
+                self.request_dashboard_refresh()
             self.root.after(5000, refresh_dashboard)
         
         self.root.after(1000, refresh_dashboard)
+
+    def setup_maintenance(self):
+        def run_maintenance():
+            if self._maintenance_thread is None or not self._maintenance_thread.is_alive():
+                self._maintenance_thread = threading.Thread(target=self.data_manager.maintain,
+                                                            daemon=True)
+                self._maintenance_thread.start()
+            self.root.after(self.MAINTENANCE_INTERVAL_MS, run_maintenance)
+
+        self.root.after(60000, run_maintenance)
+
+    def request_dashboard_refresh(self, force=False):
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            self._refresh_pending = True
+            self._refresh_force = self._refresh_force or force
+            return
+
+        self._refresh_thread = threading.Thread(target=self._compute_dashboard,
+                                                args=(force, self.history_view.head_key()),
+                                                daemon=True)
+        self._refresh_thread.start()
+        self.root.after(50, self._poll_dashboard_refresh)
+
+    def _compute_dashboard(self, force, history_head):
+        # _poll_dashboard_refresh waits for exactly one result per thread, so the
+        # None sentinel is posted even when the refresh fails with any exception.
+        result = None
+        try:
+            self.log_writer.flush()
+            marker = self.data_manager.change_marker()
+            stale = time.monotonic() - self._last_refresh_time >= 60
+            if force or stale or marker != self._last_refresh_marker:
+                result = (marker, self.data_manager.get_statistics(),
+                          self.history_view.fetch_refresh(history_head))
+        finally:
+            self._refresh_results.put(result)
+
+    def _poll_dashboard_refresh(self):
+        try:
+            result = self._refresh_results.get_nowait()
+        except queue.Empty:
+            self.root.after(50, self._poll_dashboard_refresh)
+            return
+
+        if result is not None:
+            self._last_refresh_marker, stats, history = result
+            self._last_refresh_time = time.monotonic()
+            self.show_dashboard(stats, history)
+
+        if self._refresh_pending:
+            force = self._refresh_force
+            self._refresh_pending = False
+            self._refresh_force = False
+            self.request_dashboard_refresh(force)
     
     def setup_dashboard_interface(self):
         main_frame = ttk.Frame(self.tab_dashboard)
@@ -205,18 +1971,35 @@ class CalculatorGeometrie:
         ttk.Button(kpi_frame, text="Refresh", 
                   command=self.update_dashboard).grid(row=0, column=3, padx=20, pady=5)
         
+        self.cache_label = ttk.Label(kpi_frame, text="")
+        self.cache_label.grid(row=1, column=0, columnspan=4, padx=20, sticky='w')
+
+        self.log_label = ttk.Label(kpi_frame, text="")
+        self.log_label.grid(row=2, column=0, columnspan=4, padx=20, sticky='w')
+
+        self.stages_label = ttk.Label(kpi_frame, text="")
+        self.stages_label.grid(row=3, column=0, columnspan=4, padx=20, sticky='w')
+
+        self.profile_label = ttk.Label(kpi_frame, text="")
+        self.profile_label.grid(row=4, column=0, columnspan=4, padx=20, sticky='w')
+
         charts_frame = ttk.Frame(main_frame)
         charts_frame.pack(fill='both', expand=True)
         
         left_frame = ttk.LabelFrame(charts_frame, text="Analiza Vizuala", padding=10)
         left_frame.pack(side='left', fill='both', expand=True, padx=(0, 5))
         
-        right_frame = ttk.LabelFrame(charts_frame, text="Istoric Recent", padding=10)
+        right_frame = ttk.LabelFrame(charts_frame, text="Istoric Calcule", padding=10)
         right_frame.pack(side='right', fill='y', padx=(5, 0))
         
         self.charts_canvas_frame = ttk.Frame(left_frame)
         self.charts_canvas_frame.pack(fill='both', expand=True)
         
+        self.dashboard_charts = DashboardCharts(Figure(figsize=(12, 8), dpi=100))
+        self.dashboard_canvas = FigureCanvasTkAgg(self.dashboard_charts.figure, self.charts_canvas_frame)
+        self.dashboard_canvas.draw()
+        self.dashboard_canvas.get_tk_widget().pack(fill='both', expand=True)
+
         self.history_tree = ttk.Treeview(right_frame, columns=('Shape', 'Time', 'Result'), 
                                         show='headings', height=15)
         self.history_tree.heading('Shape', text='Forma')
@@ -224,11 +2007,11 @@ class CalculatorGeometrie:
         self.history_tree.heading('Result', text='Rezultat')
         
         self.history_tree.column('Shape', width=100)
-        self.history_tree.column('Time', width=80)
+        self.history_tree.column('Time', width=100)
         self.history_tree.column('Result', width=120)
         
         scrollbar = ttk.Scrollbar(right_frame, orient='vertical', command=self.history_tree.yview)
-        self.history_tree.configure(yscrollcommand=scrollbar.set)
+        self.history_view = HistoryView(self.history_tree, scrollbar, self.data_manager)
         
         self.history_tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
@@ -236,93 +2019,56 @@ class CalculatorGeometrie:
         self.update_dashboard()
     
     def update_dashboard(self):
-        stats = self.data_manager.get_statistics()
+        self.request_dashboard_refresh(force=True)
         
+    def show_dashboard(self, stats, history=None):
         self.total_calc_label.config(text=f"Total Calcule: {stats['total_calculations']}")
         self.popular_shape_label.config(text=f"Forma Populara: {stats['most_popular_shape']}")
-        self.avg_time_label.config(text=f"Timp Mediu: {stats['avg_calculation_time']:.1f}ms")
-        
+        compute = stats['stage_percentiles'].get('compute')
+        if compute:
+            self.avg_time_label.config(
+                text=f"Timp Formula: p50 {compute['p50']:.3f}ms / p99 {compute['p99']:.3f}ms")
+        else:
+            self.avg_time_label.config(text=f"Timp Mediu: {stats['avg_calculation_time']:.1f}ms")
+        self.stages_label.config(text="Etape (p50 / p90 / p99): " + ", ".join(
+            f"{nume} {stats['stage_percentiles'][stage]['p50']:.3f} / "
+            f"{stats['stage_percentiles'][stage]['p90']:.3f} / "
+            f"{stats['stage_percentiles'][stage]['p99']:.3f} ms"
+            for stage, nume in (('compute', 'formula'), ('log', 'punere in coada jurnal'),
+                                ('render', 'randare'))
+            if stage in stats['stage_percentiles']))
+
+        result_stats = self.result_cache.stats()
+        render_stats = self.render_cache.stats()
+        self.cache_label.config(
+            text=f"Cache rezultate: {result_stats['entries']} intrari, "
+                 f"{result_stats['hit_rate']:.0%} hit, {result_stats['evictions']} evacuari | "
+                 f"Cache randari 3D: {render_stats['entries']} imagini, "
+                 f"{render_stats['bytes'] / 2**20:.1f}/{render_stats['max_bytes'] / 2**20:.0f} MB, "
+                 f"{render_stats['hit_rate']:.0%} hit, {render_stats['evictions']} evacuari")
+
+        log_stats = self.log_writer.metrics()
+        self.log_label.config(
+            text=f"Coada jurnal: {log_stats['depth']}/{log_stats['capacity']} "
+                 f"(max {log_stats['max_depth']}), {log_stats['written']} scrise, "
+                 f"{log_stats['dropped']} pierdute, flush {log_stats['flush_ms_avg']:.1f}ms mediu / "
+                 f"{log_stats['flush_ms_max']:.1f}ms max, "
+                 f"scriere SQLite {log_stats['write_us_per_row']:.1f}us/rand")
+        
+        if self.profiler.enabled:
+            profile = self.profiler.stats()
+            self.profile_label.config(text="Profil interfata (medie / max): " + ", ".join(
+                f"{stage} {profile[stage]['avg_ms']:.3f} / {profile[stage]['max_ms']:.3f} ms "
+                f"({profile[stage]['count']}x)"
+                for stage in StageProfiler.STAGES if stage in profile))
+
         self.update_charts(stats)
         
-        self.update_history(stats['recent_calculations'])
+        self.history_view.apply_refresh(history)
     
     def update_charts(self, stats):
-        for widget in self.charts_canvas_frame.winfo_children():
-            widget.destroy()
-        
-        fig = Figure(figsize=(12, 8), dpi=100)
-        
-        if stats['shapes_frequency']:
-            ax1 = fig.add_subplot(221)
-            shapes = list(stats['shapes_frequency'].keys())
-            counts = list(stats['shapes_frequency'].values())
-            colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57']
-            ax1.pie(counts, labels=shapes, autopct='%1.1f%%', colors=colors[:len(shapes)])
-            ax1.set_title('Distributia Formelor Geometrice')
-        
-        if stats['dimensions_frequency']:
-            ax2 = fig.add_subplot(222)
-            dimensions = list(stats['dimensions_frequency'].keys())
-            counts = list(stats['dimensions_frequency'].values())
-            bars = ax2.bar(dimensions, counts, color=['#3498db', '#e74c3c'])
-            ax2.set_title('Calcule 2D vs 3D')
-            ax2.set_ylabel('Numarul de calcule')
-            
-            for bar in bars:
-                height = bar.get_height()
-                ax2.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{int(height)}', ha='center', va='bottom')
-        
-        if stats['calculations_by_hour']:
-            ax3 = fig.add_subplot(223)
-            hours = sorted(stats['calculations_by_hour'].keys())
-            counts = [stats['calculations_by_hour'][h] for h in hours]
-            ax3.plot(hours, counts, marker='o', linewidth=2, markersize=6, color='#2ecc71')
-            ax3.set_title('Activitate pe Ore')
-            ax3.set_xlabel('Ora zilei')
-            ax3.set_ylabel('Numarul de calcule')
-            ax3.grid(True, alpha=0.3)
-        
-        if stats['calculations_by_day']:
-            ax4 = fig.add_subplot(224)
-            days = sorted(stats['calculations_by_day'].keys())[-7:]
-            counts = [stats['calculations_by_day'][d] for d in days]
-            day_labels = [d.split('-')[2] + '/' + d.split('-')[1] for d in days]
-            bars = ax4.bar(day_labels, counts, color='#9b59b6')
-            ax4.set_title('Trend Ultimele 7 Zile')
-            ax4.set_xlabel('Data')
-            ax4.set_ylabel('Calcule')
-            plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45)
-        
-        plt.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, self.charts_canvas_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self.dashboard_charts.redraw(self.dashboard_canvas, self.dashboard_charts.update(stats))
     
-    def update_history(self, recent_calculations):
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-        
-        for calc in recent_calculations:
-            shape_type = calc[1]
-            timestamp = calc[8]
-            result_area = calc[4] or 0
-            result_volume = calc[6] or 0
-            
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime('%H:%M')
-            except:
-                time_str = 'N/A'
-            
-            if result_volume > 0:
-                result_str = f"V: {result_volume:.2f}"
-            else:
-                result_str = f"A: {result_area:.2f}"
-            
-            self.history_tree.insert('', 'end', values=(shape_type, time_str, result_str))
-
     def setup_2d_interface(self):
         main_frame = ttk.Frame(self.tab_2d)
         main_frame.pack(fill='both', expand=True, padx=10, pady=10)
@@ -350,6 +2096,11 @@ class CalculatorGeometrie:
         self.viz_frame_2d = ttk.LabelFrame(content_frame, text="Vizualizare", padding=10)
         self.viz_frame_2d.pack(side='right', fill='both', expand=True)
         
+        self.view_2d = ShapeView2D(Figure(figsize=(5, 4), dpi=100))
+        self.canvas_2d = FigureCanvasTkAgg(self.view_2d.figure, self.viz_frame_2d)
+        self.view_2d.attach(self.canvas_2d)
+        self.canvas_2d.get_tk_widget().pack(fill='both', expand=True)
+
         self.update_2d_inputs()
         
     def setup_3d_interface(self):
@@ -379,16 +2130,37 @@ class CalculatorGeometrie:
         self.viz_frame_3d = ttk.LabelFrame(content_frame, text="Vizualizare 3D", padding=10)
         self.viz_frame_3d.pack(side='right', fill='both', expand=True)
         
+        self.view_3d = None
+        self.canvas_3d = None
+
         self.update_3d_inputs()
     
     def clear_frame(self, frame):
-        for widget in frame.winfo_children():
-            widget.destroy()
+        with self.profiler.stage('clear_frame'):
+            for widget in frame.winfo_children():
+                widget.destroy()
+
+    def _parse(self, variable):
+        with self.profiler.stage('parse'):
+            return float(variable.get())
+
+    def _compute(self, shape_type, parametri):
+        # compute_ns covers only the cache lookup and, on a miss, the formula;
+        # parsing the Tk entries and building the result labels are not included.
+        with self.profiler.stage('formula'):
+            start = time.perf_counter_ns()
+            rezultat = self.result_cache.compute(shape_type, parametri)
+            return rezultat, time.perf_counter_ns() - start
+
+    def _log_calculation(self, **kwargs):
+        with self.profiler.stage('log'):
+            return self.log_writer.log_calculation(**kwargs)
     
     def update_2d_inputs(self):
         self.clear_frame(self.inputs_frame_2d)
         self.clear_frame(self.results_frame_2d)
-        self.clear_frame(self.viz_frame_2d)
+        self.view_2d.clear()
+        self.view_2d.render()
         
         forma = self.forma_2d.get()
         
@@ -430,7 +2202,9 @@ class CalculatorGeometrie:
     def update_3d_inputs(self):
         self.clear_frame(self.inputs_frame_3d)
         self.clear_frame(self.results_frame_3d)
-        self.clear_frame(self.viz_frame_3d)
+        if self.view_3d is not None:
+            self.view_3d.clear()
+            self.canvas_3d.draw_idle()
         
         forma = self.forma_3d.get()
         
@@ -478,100 +2252,110 @@ class CalculatorGeometrie:
                   command=self.calculate_3d).pack(pady=10)
     
     def calculate_2d(self):
-        start_time = time.time()
         try:
             forma = self.forma_2d.get()
             self.clear_frame(self.results_frame_2d)
             
             if forma == "dreptunghi":
-                lungime = float(self.lungime_var.get())
-                latime = float(self.latime_var.get())
-                arie = lungime * latime
-                perimetru = 2 * (lungime + latime)
+                lungime = self._parse(self.lungime_var)
+                latime = self._parse(self.latime_var)
+                rezultat, compute_ns = self._compute("dreptunghi", {"lungime": lungime, "latime": latime})
+                arie = float(rezultat['arie'])
+                perimetru = float(rezultat['perimetru'])
                 
-                calc_time = (time.time() - start_time) * 1000
-                self.data_manager.log_calculation(
+                render_start = time.perf_counter_ns()
+                ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
+                ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
+
+                self.draw_rectangle_2d(lungime, latime)
+
+                self._log_calculation(
                     shape_type="dreptunghi",
                     shape_dimension="2D",
                     parameters={"lungime": lungime, "latime": latime},
                     result_area=arie,
                     result_perimeter=perimetru,
-                    calculation_time_ms=calc_time,
+                    calculation_time_ms=compute_ns / 1e6,
+                    compute_ns=compute_ns,
+                    render_ns=time.perf_counter_ns() - render_start,
                     session_id=self.session_id
                 )
                 
-                ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
-                ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
-                
-                self.draw_rectangle_2d(lungime, latime)
-                
             elif forma == "patrat":
-                latura = float(self.latura_var.get())
-                arie = latura * latura
-                perimetru = 4 * latura
+                latura = self._parse(self.latura_var)
+                rezultat, compute_ns = self._compute("patrat", {"latura": latura})
+                arie = float(rezultat['arie'])
+                perimetru = float(rezultat['perimetru'])
                 
-                calc_time = (time.time() - start_time) * 1000
-                self.data_manager.log_calculation(
+                render_start = time.perf_counter_ns()
+                ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
+                ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
+
+                self.draw_square_2d(latura)
+
+                self._log_calculation(
                     shape_type="patrat",
                     shape_dimension="2D",
                     parameters={"latura": latura},
                     result_area=arie,
                     result_perimeter=perimetru,
-                    calculation_time_ms=calc_time,
+                    calculation_time_ms=compute_ns / 1e6,
+                    compute_ns=compute_ns,
+                    render_ns=time.perf_counter_ns() - render_start,
                     session_id=self.session_id
                 )
                 
-                ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
-                ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
-                
-                self.draw_square_2d(latura)
-                
             elif forma == "cerc":
-                raza = float(self.raza_var.get())
-                arie = math.pi * raza * raza
-                perimetru = 2 * math.pi * raza
+                raza = self._parse(self.raza_var)
+                rezultat, compute_ns = self._compute("cerc", {"raza": raza})
+                arie = float(rezultat['arie'])
+                perimetru = float(rezultat['perimetru'])
                 
-                calc_time = (time.time() - start_time) * 1000
-                self.data_manager.log_calculation(
+                render_start = time.perf_counter_ns()
+                ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
+                ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
+
+                self.draw_circle_2d(raza)
+
+                self._log_calculation(
                     shape_type="cerc",
                     shape_dimension="2D",
                     parameters={"raza": raza},
                     result_area=arie,
                     result_perimeter=perimetru,
-                    calculation_time_ms=calc_time,
+                    calculation_time_ms=compute_ns / 1e6,
+                    compute_ns=compute_ns,
+                    render_ns=time.perf_counter_ns() - render_start,
                     session_id=self.session_id
                 )
                 
-                ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
-                ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
-                
-                self.draw_circle_2d(raza)
-                
             elif forma == "triunghi":
-                a = float(self.a_var.get())
-                b = float(self.b_var.get())
-                c = float(self.c_var.get())
+                a = self._parse(self.a_var)
+                b = self._parse(self.b_var)
+                c = self._parse(self.c_var)
                 
-                if (a + b > c) and (a + c > b) and (b + c > a):
-                    s = (a + b + c) / 2
-                    arie = math.sqrt(s * (s - a) * (s - b) * (s - c))
-                    perimetru = a + b + c
+                rezultat, compute_ns = self._compute("triunghi", {"a": a, "b": b, "c": c})
+                if rezultat['valid']:
+                    arie = float(rezultat['arie'])
+                    perimetru = float(rezultat['perimetru'])
                     
-                    calc_time = (time.time() - start_time) * 1000
-                    self.data_manager.log_calculation(
+                    render_start = time.perf_counter_ns()
+                    ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
+                    ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
+
+                    self.draw_triangle_2d(a, b, c)
+
+                    self._log_calculation(
                         shape_type="triunghi",
                         shape_dimension="2D",
                         parameters={"a": a, "b": b, "c": c},
                         result_area=arie,
                         result_perimeter=perimetru,
-                        calculation_time_ms=calc_time,
+                        calculation_time_ms=compute_ns / 1e6,
+                        compute_ns=compute_ns,
+                        render_ns=time.perf_counter_ns() - render_start,
                         session_id=self.session_id
                     )
-                    
-                    ttk.Label(self.results_frame_2d, text=f"Arie: {arie:.3f}").pack(pady=2)
-                    ttk.Label(self.results_frame_2d, text=f"Perimetru: {perimetru:.3f}").pack(pady=2)
-                    
-                    self.draw_triangle_2d(a, b, c)
                 else:
                     messagebox.showerror("Eroare", "Nu se poate forma triunghi cu aceste laturi!")
                     
@@ -579,330 +2363,227 @@ class CalculatorGeometrie:
             messagebox.showerror("Eroare", "Introduceti valori numerice valide!")
     
     def calculate_3d(self):
-        start_time = time.time()
         try:
             forma = self.forma_3d.get()
             self.clear_frame(self.results_frame_3d)
             
             if forma == "cub":
-                latura = float(self.latura_3d_var.get())
-                volum = latura ** 3
-                arie_totala = 6 * latura ** 2
+                latura = self._parse(self.latura_3d_var)
+                rezultat, compute_ns = self._compute("cub", {"latura": latura})
+                volum = float(rezultat['volum'])
+                arie_totala = float(rezultat['arie_totala'])
                 
-                calc_time = (time.time() - start_time) * 1000
-                self.data_manager.log_calculation(
+                render_start = time.perf_counter_ns()
+                ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
+                ttk.Label(self.results_frame_3d, text=f"Arie totala: {arie_totala:.3f}").pack(pady=2)
+
+                self.draw_cube_3d(latura)
+
+                self._log_calculation(
                     shape_type="cub",
                     shape_dimension="3D",
                     parameters={"latura": latura},
                     result_volume=volum,
-                    calculation_time_ms=calc_time,
+                    calculation_time_ms=compute_ns / 1e6,
+                    compute_ns=compute_ns,
+                    render_ns=time.perf_counter_ns() - render_start,
                     session_id=self.session_id
                 )
                 
-                ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
-                ttk.Label(self.results_frame_3d, text=f"Arie totala: {arie_totala:.3f}").pack(pady=2)
-                
-                self.draw_cube_3d(latura)
-                
             elif forma == "paralelpiped":
-                lungime = float(self.lungime_3d_var.get())
-                latime = float(self.latime_3d_var.get())
-                inaltime = float(self.inaltime_3d_var.get())
+                lungime = self._parse(self.lungime_3d_var)
+                latime = self._parse(self.latime_3d_var)
+                inaltime = self._parse(self.inaltime_3d_var)
                 
-                volum = lungime * latime * inaltime
-                arie_totala = 2 * (lungime * latime + lungime * inaltime + latime * inaltime)
+                rezultat, compute_ns = self._compute("paralelpiped", {"lungime": lungime, "latime": latime, "inaltime": inaltime})
+                volum = float(rezultat['volum'])
+                arie_totala = float(rezultat['arie_totala'])
                 
-                calc_time = (time.time() - start_time) * 1000
-                self.data_manager.log_calculation(
+                render_start = time.perf_counter_ns()
+                ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
+                ttk.Label(self.results_frame_3d, text=f"Arie totala: {arie_totala:.3f}").pack(pady=2)
+
+                self.draw_parallelepiped_3d(lungime, latime, inaltime)
+
+                self._log_calculation(
                     shape_type="paralelpiped",
                     shape_dimension="3D",
                     parameters={"lungime": lungime, "latime": latime, "inaltime": inaltime},
                     result_volume=volum,
-                    calculation_time_ms=calc_time,
+                    calculation_time_ms=compute_ns / 1e6,
+                    compute_ns=compute_ns,
+                    render_ns=time.perf_counter_ns() - render_start,
                     session_id=self.session_id
                 )
                 
-                ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
-                ttk.Label(self.results_frame_3d, text=f"Arie totala: {arie_totala:.3f}").pack(pady=2)
-                
-                self.draw_parallelepiped_3d(lungime, latime, inaltime)
-                
             elif forma == "sfera":
-                raza = float(self.raza_3d_var.get())
-                volum = (4/3) * math.pi * raza ** 3
-                arie = 4 * math.pi * raza ** 2
+                raza = self._parse(self.raza_3d_var)
+                rezultat, compute_ns = self._compute("sfera", {"raza": raza})
+                volum = float(rezultat['volum'])
+                arie = float(rezultat['arie_totala'])
                 
-                calc_time = (time.time() - start_time) * 1000
-                self.data_manager.log_calculation(
+                render_start = time.perf_counter_ns()
+                ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
+                ttk.Label(self.results_frame_3d, text=f"Arie: {arie:.3f}").pack(pady=2)
+
+                self.draw_sphere_3d(raza)
+
+                self._log_calculation(
                     shape_type="sfera",
                     shape_dimension="3D",
                     parameters={"raza": raza},
                     result_volume=volum,
-                    calculation_time_ms=calc_time,
+                    calculation_time_ms=compute_ns / 1e6,
+                    compute_ns=compute_ns,
+                    render_ns=time.perf_counter_ns() - render_start,
                     session_id=self.session_id
                 )
                 
-                ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
-                ttk.Label(self.results_frame_3d, text=f"Arie: {arie:.3f}").pack(pady=2)
-                
-                self.draw_sphere_3d(raza)
-                
             elif forma == "prisma":
-                a = float(self.a_3d_var.get())
-                b = float(self.b_3d_var.get())
-                c = float(self.c_3d_var.get())
-                inaltime = float(self.inaltime_prisma_var.get())
+                a = self._parse(self.a_3d_var)
+                b = self._parse(self.b_3d_var)
+                c = self._parse(self.c_3d_var)
+                inaltime = self._parse(self.inaltime_prisma_var)
                 
-                if (a + b > c) and (a + c > b) and (b + c > a):
-                    s = (a + b + c) / 2
-                    arie_baza = math.sqrt(s * (s - a) * (s - b) * (s - c))
-                    volum = arie_baza * inaltime
+                rezultat, compute_ns = self._compute("prisma", {"a": a, "b": b, "c": c, "inaltime": inaltime})
+                if rezultat['valid']:
+                    arie_baza = float(rezultat['arie_baza'])
+                    volum = float(rezultat['volum'])
                     
-                    calc_time = (time.time() - start_time) * 1000
-                    self.data_manager.log_calculation(
+                    render_start = time.perf_counter_ns()
+                    ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
+                    ttk.Label(self.results_frame_3d, text=f"Arie baza: {arie_baza:.3f}").pack(pady=2)
+
+                    self.draw_prism_3d(a, b, c, inaltime)
+
+                    self._log_calculation(
                         shape_type="prisma",
                         shape_dimension="3D",
                         parameters={"a": a, "b": b, "c": c, "inaltime": inaltime},
                         result_volume=volum,
-                        calculation_time_ms=calc_time,
+                        calculation_time_ms=compute_ns / 1e6,
+                        compute_ns=compute_ns,
+                        render_ns=time.perf_counter_ns() - render_start,
                         session_id=self.session_id
                     )
-                    
-                    ttk.Label(self.results_frame_3d, text=f"Volum: {volum:.3f}").pack(pady=2)
-                    ttk.Label(self.results_frame_3d, text=f"Arie baza: {arie_baza:.3f}").pack(pady=2)
-                    
-                    self.draw_prism_3d(a, b, c, inaltime)
                 else:
                     messagebox.showerror("Eroare", "Nu se poate forma prisma cu aceste laturi pentru baza!")
                     
         except ValueError:
             messagebox.showerror("Eroare", "Introduceti valori numerice valide!")
     
-    def draw_rectangle_2d(self, lungime, latime):
-        self.clear_frame(self.viz_frame_2d)
-        
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        x = -lungime / 2
-        y = -latime / 2
-        
-        rectangle = patches.Rectangle((x, y), lungime, latime, 
-                                    fill=False, color='blue', linewidth=2)
-        ax.add_patch(rectangle)
-        
-        spatiu = max(lungime, latime) * 0.3
-        ax.set_xlim(x - spatiu, x + lungime + spatiu)
-        ax.set_ylim(y - spatiu, y + latime + spatiu)
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3)
-        ax.set_title(f'Dreptunghi {lungime}x{latime}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_2d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+    def _draw_2d(self, key, method, *args):
+        if self.view_2d.shown == key:
+            return
+        with self.profiler.stage('figure'):
+            getattr(self.view_2d, method)(*args)
+        self.view_2d.shown = key
+        with self.profiler.stage('canvas_draw'):
+            self.view_2d.render()
     
+    def _draw_3d(self, key, method, *args):
+        view = self.ensure_view_3d()
+        if view.shown == key:
+            return
+
+        render_key = view.render_key(key)
+        image = self.render_cache.get(render_key)
+        if image is not None:
+            view.defer(key, method, *args)
+            with self.profiler.stage('canvas_draw'):
+                self.canvas_3d.get_renderer()
+                self.canvas_3d.restore_region(image)
+                self.canvas_3d.blit(view.figure.bbox)
+            return
+
+        with self.profiler.stage('figure'):
+            view.show(key, method, *args)
+        with self.profiler.stage('canvas_draw'):
+            self.canvas_3d.draw()
+        self.render_cache.put(render_key, self.canvas_3d.copy_from_bbox(view.figure.bbox))
+
+    def draw_rectangle_2d(self, lungime, latime):
+        self._draw_2d(("dreptunghi", lungime, latime), "draw_rectangle", lungime, latime)
+
     def draw_square_2d(self, latura):
-        self.clear_frame(self.viz_frame_2d)
-        
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        x = -latura / 2
-        y = -latura / 2
-        
-        square = patches.Rectangle((x, y), latura, latura, 
-                                 fill=False, color='green', linewidth=2)
-        ax.add_patch(square)
-        
-        spatiu = latura * 0.3
-        ax.set_xlim(x - spatiu, x + latura + spatiu)
-        ax.set_ylim(y - spatiu, y + latura + spatiu)
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3)
-        ax.set_title(f'Patrat cu latura {latura}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_2d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_2d(("patrat", latura), "draw_square", latura)
     
     def draw_circle_2d(self, raza):
-        self.clear_frame(self.viz_frame_2d)
-        
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        circle = plt.Circle((0, 0), raza, fill=False, color='red', linewidth=2)
-        ax.add_patch(circle)
-        
-        ax.plot([0, raza], [0, 0], 'r--', linewidth=1)
-        ax.plot(0, 0, 'ro', markersize=5)
-        
-        spatiu = raza * 0.3
-        ax.set_xlim(-raza - spatiu, raza + spatiu)
-        ax.set_ylim(-raza - spatiu, raza + spatiu)
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3)
-        ax.set_title(f'Cerc cu raza {raza}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_2d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_2d(("cerc", raza), "draw_circle", raza)
     
     def draw_triangle_2d(self, a, b, c):
-        self.clear_frame(self.viz_frame_2d)
-        
-        fig = Figure(figsize=(5, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        
-        latura_medie = (a + b + c) / 3
-        inaltime = latura_medie * math.sqrt(3) / 2
-        
-        punctul_A = [0, 0]
-        punctul_B = [latura_medie, 0]
-        punctul_C = [latura_medie/2, inaltime]
-        
-        triangle = patches.Polygon([punctul_A, punctul_B, punctul_C], 
-                                 fill=False, color='purple', linewidth=2)
-        ax.add_patch(triangle)
-        
-        ax.plot([punctul_A[0], punctul_B[0], punctul_C[0]], 
-               [punctul_A[1], punctul_B[1], punctul_C[1]], 'o', color='purple', markersize=5)
-        
-        spatiu = latura_medie * 0.2
-        ax.set_xlim(-spatiu, latura_medie + spatiu)
-        ax.set_ylim(-spatiu, inaltime + spatiu)
-        ax.set_aspect('equal')
-        ax.grid(True, alpha=0.3)
-        ax.set_title(f'Triunghi {a}-{b}-{c}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_2d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_2d(("triunghi", a, b, c), "draw_triangle", a, b, c)
     
+    def ensure_view_3d(self):
+        if self.view_3d is None:
+            self.view_3d = ShapeView3D(Figure(figsize=(6, 5), dpi=100))
+            self.canvas_3d = FigureCanvasTkAgg(self.view_3d.figure, self.viz_frame_3d)
+            self.view_3d.attach(self.canvas_3d)
+            self.canvas_3d.get_tk_widget().pack(fill='both', expand=True)
+        return self.view_3d
+
     def draw_cube_3d(self, latura):
-        self.clear_frame(self.viz_frame_3d)
-        
-        fig = Figure(figsize=(6, 5), dpi=100)
-        ax = fig.add_subplot(111, projection='3d')
-        
-        valori = [-latura/2, latura/2]
-        X, Y = np.meshgrid(valori, valori)
-        
-        ax.plot_surface(X, Y, np.ones_like(X) * latura/2, alpha=0.6, color='lightblue')
-        ax.plot_surface(X, Y, np.ones_like(X) * -latura/2, alpha=0.6, color='lightblue')
-        ax.plot_surface(X, np.ones_like(X) * latura/2, Y, alpha=0.6, color='lightgreen')
-        ax.plot_surface(X, np.ones_like(X) * -latura/2, Y, alpha=0.6, color='lightgreen')
-        ax.plot_surface(np.ones_like(X) * latura/2, X, Y, alpha=0.6, color='lightcoral')
-        ax.plot_surface(np.ones_like(X) * -latura/2, X, Y, alpha=0.6, color='lightcoral')
-        
-        ax.set_xlim([-latura, latura])
-        ax.set_ylim([-latura, latura])
-        ax.set_zlim([-latura, latura])
-        ax.set_title(f'Cub cu latura {latura}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_3d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_3d(("cub", latura), "draw_cube", latura)
     
     def draw_parallelepiped_3d(self, lungime, latime, inaltime):
-        self.clear_frame(self.viz_frame_3d)
-        
-        fig = Figure(figsize=(6, 5), dpi=100)
-        ax = fig.add_subplot(111, projection='3d')
-        
-        coordonate_x = [-lungime/2, lungime/2]
-        coordonate_y = [-latime/2, latime/2]
-        coordonate_z = [-inaltime/2, inaltime/2]
-        
-        X, Y = np.meshgrid(coordonate_x, coordonate_y)
-        ax.plot_surface(X, Y, np.ones_like(X) * coordonate_z[1], alpha=0.6, color='lightblue')
-        ax.plot_surface(X, Y, np.ones_like(X) * coordonate_z[0], alpha=0.6, color='lightblue')
-        
-        X, Z = np.meshgrid(coordonate_x, coordonate_z)
-        ax.plot_surface(X, np.ones_like(X) * coordonate_y[1], Z, alpha=0.6, color='lightgreen')
-        ax.plot_surface(X, np.ones_like(X) * coordonate_y[0], Z, alpha=0.6, color='lightgreen')
-        
-        Y, Z = np.meshgrid(coordonate_y, coordonate_z)
-        ax.plot_surface(np.ones_like(Y) * coordonate_x[1], Y, Z, alpha=0.6, color='lightcoral')
-        ax.plot_surface(np.ones_like(Y) * coordonate_x[0], Y, Z, alpha=0.6, color='lightcoral')
-        
-        dim_max = max(lungime, latime, inaltime)
-        ax.set_xlim([-dim_max, dim_max])
-        ax.set_ylim([-dim_max, dim_max])
-        ax.set_zlim([-dim_max, dim_max])
-        ax.set_title(f'Paralelpiped {lungime}x{latime}x{inaltime}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_3d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_3d(("paralelpiped", lungime, latime, inaltime), "draw_parallelepiped",
+                      lungime, latime, inaltime)
     
     def draw_sphere_3d(self, raza):
-        self.clear_frame(self.viz_frame_3d)
-        
-        fig = Figure(figsize=(6, 5), dpi=100)
-        ax = fig.add_subplot(111, projection='3d')
-        
-        unghi_u = np.linspace(0, 2 * np.pi, 30)
-        unghi_v = np.linspace(0, np.pi, 30)
-        
-        coordonata_x = raza * np.outer(np.cos(unghi_u), np.sin(unghi_v))
-        coordonata_y = raza * np.outer(np.sin(unghi_u), np.sin(unghi_v))
-        coordonata_z = raza * np.outer(np.ones(np.size(unghi_u)), np.cos(unghi_v))
-        
-        ax.plot_surface(coordonata_x, coordonata_y, coordonata_z, alpha=0.6, color='lightcoral')
-        ax.scatter([0], [0], [0], color='black', s=30)
-        
-        ax.set_xlim([-raza*1.2, raza*1.2])
-        ax.set_ylim([-raza*1.2, raza*1.2])
-        ax.set_zlim([-raza*1.2, raza*1.2])
-        ax.set_title(f'Sfera cu raza {raza}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_3d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_3d(("sfera", raza), "draw_sphere", raza)
     
     def draw_prism_3d(self, a, b, c, inaltime):
-        self.clear_frame(self.viz_frame_3d)
-        
-        fig = Figure(figsize=(6, 5), dpi=100)
-        ax = fig.add_subplot(111, projection='3d')
-        
-        latura_medie = (a + b + c) / 3
-        inaltime_triunghi = latura_medie * math.sqrt(3) / 2
-        
-        A_jos = [0, 0, -inaltime/2]
-        B_jos = [latura_medie, 0, -inaltime/2]
-        C_jos = [latura_medie/2, inaltime_triunghi, -inaltime/2]
-        
-        A_sus = [0, 0, inaltime/2]
-        B_sus = [latura_medie, 0, inaltime/2]
-        C_sus = [latura_medie/2, inaltime_triunghi, inaltime/2]
-        
-        fetele = [
-            [A_jos, B_jos, C_jos],
-            [A_sus, B_sus, C_sus],
-            [A_jos, A_sus, B_sus, B_jos],
-            [B_jos, B_sus, C_sus, C_jos],
-            [C_jos, C_sus, A_sus, A_jos]
-        ]
-        
-        poligon = Poly3DCollection(fetele, alpha=0.6, facecolor='lightpink', edgecolor='black')
-        ax.add_collection3d(poligon)
-        
-        coordonata_maxima = max(latura_medie, inaltime_triunghi, inaltime)
-        ax.set_xlim([0-coordonata_maxima*0.2, latura_medie+coordonata_maxima*0.2])
-        ax.set_ylim([0-coordonata_maxima*0.2, inaltime_triunghi+coordonata_maxima*0.2])
-        ax.set_zlim([-inaltime/2-coordonata_maxima*0.2, inaltime/2+coordonata_maxima*0.2])
-        ax.set_title(f'Prisma triunghiulara\nBaza: {a}-{b}-{c}, Inaltime: {inaltime}')
-        
-        canvas = FigureCanvasTkAgg(fig, self.viz_frame_3d)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+        self._draw_3d(("prisma", a, b, c, inaltime), "draw_prism", a, b, c, inaltime)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calculator Geometrie - AI Analytics Platform")
+    parser.add_argument("--profile", nargs="?", const="1", metavar="FISIER",
+                        help="Masoara etapele interfetei si salveaza un profil cProfile "
+                             f"(implicit {StageProfiler.DEFAULT_OUTPUT}; "
+                             f"echivalent cu {StageProfiler.ENV_VAR}=FISIER)")
+    parser.add_argument("--retention-days", type=int,
+                        help="Arhiveaza periodic calculele mai vechi de N zile")
+    subparsers = parser.add_subparsers(dest="command")
+
+    rebuild = subparsers.add_parser("rebuild-rollups",
+                                    help="Regenereaza tabelele agregate din calculations")
+    rebuild.add_argument("--db", default="geometry_analytics.db")
+
+    compact = subparsers.add_parser("compact",
+                                    help="Aplica retentia, arhiveaza pe luni si elibereaza spatiul")
+    compact.add_argument("--db", default="geometry_analytics.db")
+    compact.add_argument("--retention-days", type=int,
+                         help="Muta/sterge calculele brute mai vechi de N zile")
+    compact.add_argument("--no-archive", action="store_true",
+                         help="Sterge calculele vechi in loc sa le mute in baze lunare")
+    compact.add_argument("--hourly-days", type=int, default=90,
+                         help="Pastreaza agregatele orare atatea zile (cele zilnice raman)")
+    compact.add_argument("--vacuum", action="store_true",
+                         help="VACUUM complet (activeaza si auto_vacuum incremental)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "rebuild-rollups":
+        rows = DataManager(args.db).rebuild_rollups()
+        print(f"Rollup-uri regenerate din {rows} calcule")
+        return
+
+    if args.command == "compact":
+        data_manager = DataManager(args.db, archive=not args.no_archive, hourly_days=args.hourly_days)
+        result = data_manager.apply_retention(args.retention_days)
+        print(f"{result['archived']} calcule arhivate, {result['deleted']} sterse din {args.db}")
+        for path in result['partitions']:
+            print(f"  {path}")
+        if args.vacuum:
+            data_manager.vacuum()
+        else:
+            data_manager.incremental_vacuum(pages=2**31 - 1)
+        print(f"Dimensiune: {os.path.getsize(args.db) / 2**20:.1f} MB")
+        return
 
-def main():
+    _load_tk()
     root = tk.Tk()
-    app = CalculatorGeometrie(root)
+    app = CalculatorGeometrie(root, StageProfiler.from_environment(args.profile), args.retention_days)
     root.mainloop()
 
 if __name__ == "__main__":
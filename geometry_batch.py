@@ -0,0 +1,292 @@
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import geometry_engine
+from calcul_gemoetrie import PARAMETER_COLUMNS
+
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+RESULT_COLUMNS = ("arie", "perimetru", "volum", "arie_totala", "arie_baza")
+OUTPUT_COLUMNS = ("shape_type",) + PARAMETER_COLUMNS + RESULT_COLUMNS + ("valid",)
+
+
+def detect_format(path, explicit=None, formats=FORMATS):
+    if explicit:
+        return explicit
+    return formats.get(os.path.splitext(path)[1].lower(), "csv")
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Formatele Arrow/Parquet necesita pachetul pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def _float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def _float_column(values):
+    column = np.asarray(values, dtype=str)
+    try:
+        return np.where(column == "", "nan", column).astype(np.float64)
+    except ValueError:
+        # A non-numeric cell only invalidates its own row.
+        return np.array([_float(value) if value else np.nan for value in values], dtype=np.float64)
+
+
+def read_csv_chunks(path, chunk_size):
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        if "shape_type" not in header:
+            raise ValueError("Fisierul de intrare trebuie sa aiba coloana shape_type")
+        positions = {name: i for i, name in enumerate(header)}
+        width = len(header)
+
+        while True:
+            rows = []
+            for row in reader:
+                if not any(row):
+                    continue
+                if len(row) != width:
+                    row = (row + [""] * width)[:width]
+                rows.append(row)
+                if len(rows) == chunk_size:
+                    break
+            if not rows:
+                return
+            columns = list(zip(*rows))
+            shapes = np.asarray(columns[positions["shape_type"]])
+            parameters = {
+                name: _float_column(columns[positions[name]])
+                for name in PARAMETER_COLUMNS if name in positions
+            }
+            yield shapes, parameters
+
+
+def read_parquet_chunks(path, chunk_size):
+    pyarrow = import_pyarrow()
+    parquet_file = pyarrow.parquet.ParquetFile(path)
+    names = set(parquet_file.schema_arrow.names)
+    if "shape_type" not in names:
+        raise ValueError("Fisierul de intrare trebuie sa aiba coloana shape_type")
+    columns = ["shape_type"] + [name for name in PARAMETER_COLUMNS if name in names]
+
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+        shapes = np.asarray(batch.column("shape_type").to_pylist())
+        parameters = {
+            name: batch.column(name).cast(pyarrow.float64()).to_numpy(zero_copy_only=False)
+            for name in columns[1:]
+        }
+        yield shapes, parameters
+
+
+def compute_chunk(shapes, parameters, executor=None, workers=1):
+    rows = len(shapes)
+    results = {name: np.full(rows, np.nan) for name in RESULT_COLUMNS}
+    valid = np.zeros(rows, dtype=bool)
+
+    for shape_type, (dimension, names) in geometry_engine.SHAPES.items():
+        mask = shapes == shape_type
+        if not mask.any():
+            continue
+
+        missing = np.full(int(mask.sum()), np.nan)
+        values = {name: parameters[name][mask] if name in parameters else missing for name in names}
+        if executor is None:
+            computed = geometry_engine.compute(shape_type, values)
+        else:
+            computed = parallel_compute(shape_type, values, executor=executor,
+                                        shard_size=max(1, -(-len(missing) // workers)))
+
+        present = np.ones(len(missing), dtype=bool)
+        for column in values.values():
+            present &= np.isfinite(column)
+
+        valid[mask] = computed["valid"] & present
+        for name in RESULT_COLUMNS:
+            if name in computed:
+                results[name][mask] = computed[name]
+
+    results["valid"] = valid
+    return results
+
+
+def _result_names(shape_type):
+    _, names = geometry_engine.shape_spec(shape_type)
+    sample = geometry_engine.compute(shape_type, np.ones((1, len(names))))
+    return tuple(name for name in sample if name != "valid")
+
+
+def _compute_shard(shape_type, input_name, output_name, rows, start, stop):
+    _, names = geometry_engine.SHAPES[shape_type]
+    result_names = _result_names(shape_type)
+
+    input_block = shared_memory.SharedMemory(name=input_name)
+    output_block = shared_memory.SharedMemory(name=output_name)
+    try:
+        inputs = np.ndarray((len(names), rows), dtype=np.float64, buffer=input_block.buf)
+        outputs = np.ndarray((len(result_names) + 1, rows), dtype=np.float64, buffer=output_block.buf)
+
+        computed = geometry_engine.compute(
+            shape_type, {name: inputs[i, start:stop] for i, name in enumerate(names)})
+        for i, name in enumerate(result_names):
+            outputs[i, start:stop] = computed[name]
+        outputs[-1, start:stop] = computed["valid"]
+        del inputs, outputs, computed
+    finally:
+        input_block.close()
+        output_block.close()
+    return stop - start
+
+
+def parallel_compute(shape_type, parametri, workers=None, shard_size=1_000_000, executor=None):
+    _, names = geometry_engine.shape_spec(shape_type)
+    if isinstance(parametri, dict):
+        columns = [np.asarray(parametri[name], dtype=np.float64).ravel() for name in names]
+    else:
+        matrice = np.asarray(parametri, dtype=np.float64)
+        if matrice.ndim != 2 or matrice.shape[1] != len(names):
+            raise ValueError(f"{shape_type} asteapta o matrice N x {len(names)} ({', '.join(names)})")
+        columns = [matrice[:, i] for i in range(len(names))]
+
+    rows = len(columns[0])
+    result_names = _result_names(shape_type)
+    if rows == 0:
+        return geometry_engine.compute(shape_type, {name: column for name, column in zip(names, columns)})
+
+    input_block = shared_memory.SharedMemory(create=True, size=len(names) * rows * 8)
+    output_block = shared_memory.SharedMemory(create=True, size=(len(result_names) + 1) * rows * 8)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        inputs = np.ndarray((len(names), rows), dtype=np.float64, buffer=input_block.buf)
+        for i, column in enumerate(columns):
+            inputs[i] = column
+        del inputs
+
+        futures = [
+            executor.submit(_compute_shard, shape_type, input_block.name, output_block.name,
+                            rows, start, min(start + shard_size, rows))
+            for start in range(0, rows, shard_size)
+        ]
+        for future in futures:
+            future.result()
+
+        outputs = np.ndarray((len(result_names) + 1, rows), dtype=np.float64, buffer=output_block.buf)
+        results = {name: outputs[i].copy() for i, name in enumerate(result_names)}
+        results["valid"] = outputs[-1] != 0
+        del outputs
+        return results
+    finally:
+        if own_executor:
+            executor.shutdown()
+        input_block.close()
+        input_block.unlink()
+        output_block.close()
+        output_block.unlink()
+
+
+class CsvResultWriter:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(OUTPUT_COLUMNS)
+
+    def write(self, shapes, parameters, results):
+        columns = [shapes.tolist()]
+        for name in PARAMETER_COLUMNS + RESULT_COLUMNS:
+            values = parameters.get(name, results.get(name))
+            if values is None:
+                columns.append([""] * len(shapes))
+            else:
+                columns.append(["" if v != v else v for v in values.tolist()])
+        columns.append(results["valid"].astype(np.int8).tolist())
+        self._writer.writerows(zip(*columns))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetResultWriter:
+    def __init__(self, path):
+        self._pyarrow = import_pyarrow()
+        fields = [self._pyarrow.field("shape_type", self._pyarrow.string())]
+        fields += [self._pyarrow.field(name, self._pyarrow.float64())
+                   for name in PARAMETER_COLUMNS + RESULT_COLUMNS]
+        fields.append(self._pyarrow.field("valid", self._pyarrow.bool_()))
+        self._schema = self._pyarrow.schema(fields)
+        self._writer = self._pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, shapes, parameters, results):
+        rows = len(shapes)
+        arrays = [self._pyarrow.array(shapes.tolist(), self._pyarrow.string())]
+        for name in PARAMETER_COLUMNS + RESULT_COLUMNS:
+            values = parameters.get(name, results.get(name))
+            if values is None:
+                values = np.full(rows, np.nan)
+            arrays.append(self._pyarrow.array(values, self._pyarrow.float64(), from_pandas=True))
+        arrays.append(self._pyarrow.array(results["valid"]))
+        self._writer.write_table(self._pyarrow.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def run_batch(input_path, output_path, chunk_size=100_000, input_format=None, output_format=None,
+              workers=1):
+    input_format = detect_format(input_path, input_format)
+    output_format = detect_format(output_path, output_format)
+
+    reader = read_parquet_chunks if input_format == "parquet" else read_csv_chunks
+    writer = ParquetResultWriter(output_path) if output_format == "parquet" else CsvResultWriter(output_path)
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for shapes, parameters in reader(input_path, chunk_size):
+            writer.write(shapes, parameters, compute_chunk(shapes, parameters, executor, workers))
+            rows += len(shapes)
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcul geometric in lot pentru fisiere CSV/Parquet")
+    parser.add_argument("input", help="Fisier de intrare cu coloana shape_type si parametrii formelor")
+    parser.add_argument("output", help="Fisier de iesire cu rezultatele")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--input-format", choices=("csv", "parquet"))
+    parser.add_argument("--output-format", choices=("csv", "parquet"))
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Procese de calcul; 0 = numarul de nuclee")
+    args = parser.parse_args(argv)
+
+    rows, elapsed = run_batch(args.input, args.output, args.chunk_size,
+                              args.input_format, args.output_format, args.workers)
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{rows} randuri in {elapsed:.2f}s ({rate:,.0f} randuri/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
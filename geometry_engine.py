@@ -0,0 +1,340 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+SHAPES = {
+    "dreptunghi": ("2D", ("lungime", "latime")),
+    "patrat": ("2D", ("latura",)),
+    "cerc": ("2D", ("raza",)),
+    "triunghi": ("2D", ("a", "b", "c")),
+    "cub": ("3D", ("latura",)),
+    "paralelpiped": ("3D", ("lungime", "latime", "inaltime")),
+    "sfera": ("3D", ("raza",)),
+    "prisma": ("3D", ("a", "b", "c", "inaltime")),
+}
+
+RESULTS = {
+    "2D": ("arie", "perimetru"),
+    "3D": ("volum", "arie_totala"),
+}
+
+
+def _as_array(valoare):
+    return np.asarray(valoare, dtype=np.float64)
+
+
+def _all_valid(*valori):
+    return np.ones(np.broadcast(*valori).shape, dtype=bool)
+
+
+def triunghi_valid(a, b, c):
+    a, b, c = _as_array(a), _as_array(b), _as_array(c)
+    return (a + b > c) & (a + c > b) & (b + c > a)
+
+
+def _heron(a, b, c, valid):
+    s = (a + b + c) / 2
+    with np.errstate(invalid='ignore'):
+        arie = np.sqrt(s * (s - a) * (s - b) * (s - c))
+    return np.where(valid, arie, np.nan)
+
+
+def dreptunghi(lungime, latime):
+    lungime, latime = _as_array(lungime), _as_array(latime)
+    return {
+        'arie': lungime * latime,
+        'perimetru': 2 * (lungime + latime),
+        'valid': _all_valid(lungime, latime),
+    }
+
+
+def patrat(latura):
+    latura = _as_array(latura)
+    return {
+        'arie': latura * latura,
+        'perimetru': 4 * latura,
+        'valid': _all_valid(latura),
+    }
+
+
+def cerc(raza):
+    raza = _as_array(raza)
+    return {
+        'arie': np.pi * raza * raza,
+        'perimetru': 2 * np.pi * raza,
+        'valid': _all_valid(raza),
+    }
+
+
+def triunghi(a, b, c):
+    a, b, c = _as_array(a), _as_array(b), _as_array(c)
+    valid = triunghi_valid(a, b, c)
+    return {
+        'arie': _heron(a, b, c, valid),
+        'perimetru': np.where(valid, a + b + c, np.nan),
+        'valid': valid,
+    }
+
+
+def cub(latura):
+    latura = _as_array(latura)
+    return {
+        'volum': latura ** 3,
+        'arie_totala': 6 * latura ** 2,
+        'valid': _all_valid(latura),
+    }
+
+
+def paralelpiped(lungime, latime, inaltime):
+    lungime, latime, inaltime = _as_array(lungime), _as_array(latime), _as_array(inaltime)
+    return {
+        'volum': lungime * latime * inaltime,
+        'arie_totala': 2 * (lungime * latime + lungime * inaltime + latime * inaltime),
+        'valid': _all_valid(lungime, latime, inaltime),
+    }
+
+
+def sfera(raza):
+    raza = _as_array(raza)
+    return {
+        'volum': (4/3) * np.pi * raza ** 3,
+        'arie_totala': 4 * np.pi * raza ** 2,
+        'valid': _all_valid(raza),
+    }
+
+
+def prisma(a, b, c, inaltime):
+    a, b, c, inaltime = _as_array(a), _as_array(b), _as_array(c), _as_array(inaltime)
+    valid = triunghi_valid(a, b, c)
+    arie_baza = _heron(a, b, c, valid)
+    return {
+        'volum': arie_baza * inaltime,
+        'arie_totala': 2 * arie_baza + (a + b + c) * inaltime,
+        'arie_baza': arie_baza,
+        'valid': valid,
+    }
+
+
+FORMULAS = {
+    "dreptunghi": dreptunghi,
+    "patrat": patrat,
+    "cerc": cerc,
+    "triunghi": triunghi,
+    "cub": cub,
+    "paralelpiped": paralelpiped,
+    "sfera": sfera,
+    "prisma": prisma,
+}
+
+
+def shape_spec(shape_type):
+    try:
+        return SHAPES[shape_type]
+    except KeyError:
+        raise ValueError(f"Forma necunoscuta: {shape_type}") from None
+
+
+def compute(shape_type, parametri):
+    dimensiune, nume = shape_spec(shape_type)
+
+    if isinstance(parametri, dict):
+        lipsa = [n for n in nume if n not in parametri]
+        if lipsa:
+            raise ValueError(f"Parametri lipsa pentru {shape_type}: {', '.join(lipsa)}")
+        valori = [parametri[n] for n in nume]
+    else:
+        matrice = _as_array(parametri)
+        if matrice.ndim != 2 or matrice.shape[1] != len(nume):
+            raise ValueError(f"{shape_type} asteapta o matrice N x {len(nume)} ({', '.join(nume)})")
+        valori = [matrice[:, i] for i in range(len(nume))]
+
+    return FORMULAS[shape_type](*valori)
+
+
+def _sweep_blocks(shape, block_size):
+    axa = len(shape) - 1
+    interior = 1
+    while axa > 0 and interior * shape[axa] <= block_size:
+        interior *= shape[axa]
+        axa -= 1
+    pas = max(1, block_size // interior)
+
+    for prefix in np.ndindex(*shape[:axa]):
+        for start in range(0, shape[axa], pas):
+            yield axa, prefix, start, min(start + pas, shape[axa])
+
+
+def sweep(shape_type, grid, targets=None, where=None, histograms=None, block_size=1_000_000):
+    _, nume = shape_spec(shape_type)
+    lipsa = [n for n in nume if n not in grid]
+    if lipsa:
+        raise ValueError(f"Parametri lipsa pentru {shape_type}: {', '.join(lipsa)}")
+
+    axe = [np.atleast_1d(_as_array(grid[n])).ravel() for n in nume]
+    shape = tuple(len(a) for a in axe)
+    if targets is None:
+        targets = [n for n in FORMULAS[shape_type](*[a[:1] for a in axe]) if n != 'valid']
+    histograms = histograms or {}
+    edges = {n: np.linspace(*interval, bins + 1) for n, (bins, interval) in histograms.items()}
+
+    stari = {n: {'count': 0, 'sum': 0.0, 'min': np.inf, 'max': -np.inf,
+                 'argmin': None, 'argmax': None} for n in targets}
+    numarari = {n: np.zeros(len(e) - 1, dtype=np.int64) for n, e in edges.items()}
+    selectate = 0
+
+    for axa, prefix, start, stop in _sweep_blocks(shape, block_size):
+        valori = {}
+        for i, n in enumerate(nume):
+            if i < axa:
+                valori[n] = axe[i][prefix[i]]
+            else:
+                forma = [1] * (len(nume) - axa)
+                forma[i - axa] = -1
+                valori[n] = (axe[i][start:stop] if i == axa else axe[i]).reshape(forma)
+
+        rezultat = FORMULAS[shape_type](*valori.values())
+        bloc = (stop - start,) + shape[axa + 1:]
+        masca = np.broadcast_to(rezultat['valid'], bloc)
+        if where is not None:
+            masca = masca & np.broadcast_to(where(valori, rezultat), bloc)
+        selectate += int(np.count_nonzero(masca))
+
+        for n in set(targets) | set(edges):
+            valoare = np.broadcast_to(rezultat[n], bloc)
+            alese = masca & ~np.isnan(valoare)
+            if not alese.any():
+                continue
+            if n in edges:
+                numarari[n] += np.histogram(valoare[alese], bins=edges[n])[0]
+            if n not in stari:
+                continue
+
+            stare = stari[n]
+            stare['count'] += int(np.count_nonzero(alese))
+            stare['sum'] += float(valoare.sum(where=alese))
+            for cheie, extrem, alegere, mai_bun in (('min', np.inf, np.argmin, np.less),
+                                                    ('max', -np.inf, np.argmax, np.greater)):
+                candidat = np.where(alese, valoare, extrem)
+                pozitie = np.unravel_index(alegere(candidat), bloc)
+                if mai_bun(candidat[pozitie], stare[cheie]):
+                    stare[cheie] = float(candidat[pozitie])
+                    index = prefix + (start + pozitie[0],) + pozitie[1:]
+                    stare['arg' + cheie] = {m: float(axe[i][index[i]]) for i, m in enumerate(nume)}
+
+    rezumat = {'shape_type': shape_type, 'points': int(np.prod(shape)), 'selected': selectate}
+    for n, stare in stari.items():
+        numar = stare.pop('count')
+        total = stare.pop('sum')
+        rezumat[n] = dict(stare, count=numar, mean=total / numar if numar else np.nan)
+        if not numar:
+            rezumat[n].update(min=np.nan, max=np.nan)
+    for n, e in edges.items():
+        rezumat.setdefault(n, {})['histogram'] = (numarari[n], e)
+    return rezumat
+
+
+class ResultCache:
+    def __init__(self, max_entries=4096, db_path=None):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if db_path:
+            self.load()
+
+    @staticmethod
+    def key(shape_type, parametri):
+        _, nume = shape_spec(shape_type)
+        return (shape_type,) + tuple(float(parametri[n]) + 0.0 for n in nume)
+
+    def get(self, shape_type, parametri):
+        key = self.key(shape_type, parametri)
+        with self._lock:
+            rezultat = self._entries.get(key)
+            if rezultat is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rezultat
+
+    def put(self, shape_type, parametri, rezultat):
+        self._store(self.key(shape_type, parametri), rezultat)
+
+    def _store(self, key, rezultat):
+        with self._lock:
+            self._entries[key] = rezultat
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def compute(self, shape_type, parametri):
+        rezultat = self.get(shape_type, parametri)
+        if rezultat is not None:
+            return rezultat
+
+        key = self.key(shape_type, parametri)
+        brut = FORMULAS[shape_type](*key[1:])
+        rezultat = {nume: bool(valoare) if nume == 'valid' else float(valoare)
+                    for nume, valoare in brut.items()}
+        if not any(v != v for v in key[1:]):
+            self._store(key, rezultat)
+        return rezultat
+
+    def stats(self):
+        with self._lock:
+            cereri = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / cereri if cereri else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                rank INTEGER NOT NULL
+            )
+        ''')
+        return conn
+
+    def load(self):
+        conn = self._connect()
+        rows = conn.execute('SELECT key, result FROM result_cache ORDER BY rank DESC LIMIT ?',
+                            (self.max_entries,)).fetchall()
+        conn.close()
+
+        with self._lock:
+            for key, rezultat in reversed(rows):
+                self._entries[tuple(json.loads(key))] = json.loads(rezultat)
+
+    def save(self):
+        if not self.db_path:
+            return
+        with self._lock:
+            rows = [(json.dumps(list(key)), json.dumps(rezultat), rank)
+                    for rank, (key, rezultat) in enumerate(self._entries.items())]
+
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM result_cache')
+            conn.executemany('INSERT INTO result_cache (key, result, rank) VALUES (?, ?, ?)', rows)
+        conn.close()
@@ -0,0 +1,132 @@
+import argparse
+import csv
+import json
+import sys
+import time
+
+import geometry_batch
+from calcul_gemoetrie import CALCULATION_COLUMNS, DataManager
+from geometry_batch import detect_format, import_pyarrow
+
+EXPORT_COLUMNS = ("id",) + CALCULATION_COLUMNS
+FORMATS = {
+    **geometry_batch.FORMATS,
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def _open_text(path):
+    if path == "-":
+        return sys.stdout, False
+    return open(path, "w", newline=""), True
+
+
+class CsvExportWriter:
+    def __init__(self, path):
+        self._file, self._owned = _open_text(path)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class JsonLinesExportWriter:
+    def __init__(self, path):
+        self._file, self._owned = _open_text(path)
+        self._encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def write(self, rows):
+        self._file.write("".join(self._encode(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows))
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class ArrowExportWriter:
+    def __init__(self, path, parquet=False):
+        self._pyarrow = pa = import_pyarrow()
+        types = {
+            "id": pa.int64(), "shape_type": pa.string(), "shape_dimension": pa.string(),
+            "timestamp": pa.string(), "session_id": pa.string(),
+            "compute_ns": pa.int64(), "log_ns": pa.int64(), "render_ns": pa.int64(),
+        }
+        self._schema = pa.schema([pa.field(name, types.get(name, pa.float64())) for name in EXPORT_COLUMNS])
+        if parquet:
+            self._writer = pa.parquet.ParquetWriter(path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self._schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        arrays = [self._pyarrow.array(column, field.type) for column, field in zip(columns, self._schema)]
+        self._writer.write_table(self._pyarrow.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+def open_writer(path, export_format):
+    if export_format == "jsonl":
+        return JsonLinesExportWriter(path)
+    if export_format in ("parquet", "arrow"):
+        if path == "-":
+            raise ValueError("Formatele Arrow/Parquet nu pot fi scrise la stdout")
+        return ArrowExportWriter(path, parquet=export_format == "parquet")
+    return CsvExportWriter(path)
+
+
+def export_calculations(db_path, output_path, export_format=None, batch_rows=10000,
+                        archived=True, **filters):
+    data_manager = DataManager(db_path, read_only=True)
+    writer = open_writer(output_path, detect_format(output_path, export_format, FORMATS))
+
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for batch in data_manager.iter_calculations(batch_rows=batch_rows, archived=archived, **filters):
+            writer.write(batch)
+            rows += len(batch)
+    finally:
+        writer.close()
+    return rows, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta istoricul calculelor din geometry_analytics.db")
+    parser.add_argument("output", help="Fisier de iesire (.csv, .jsonl, .parquet, .arrow) sau - pentru stdout")
+    parser.add_argument("--db", default="geometry_analytics.db")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--session", help="Doar calculele unei sesiuni")
+    parser.add_argument("--shape", help="Doar o forma (de ex. cerc)")
+    parser.add_argument("--start", help="Inceputul intervalului, inclusiv (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--end", help="Sfarsitul intervalului, exclusiv (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--batch-rows", type=int, default=10000)
+    parser.add_argument("--no-archive", action="store_true",
+                        help="Ignora bazele lunare arhivate de comanda compact")
+    args = parser.parse_args(argv)
+
+    try:
+        rows, elapsed = export_calculations(args.db, args.output, args.format, args.batch_rows,
+                                            archived=not args.no_archive, session_id=args.session,
+                                            shape_type=args.shape, start=args.start, end=args.end)
+    except FileNotFoundError as exc:
+        parser.error(str(exc))
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{rows} calcule exportate in {elapsed:.2f}s ({rate:,.0f} randuri/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
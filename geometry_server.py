@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import json
+import math
+import sqlite3
+import time
+
+import numpy as np
+
+import geometry_engine
+from calcul_gemoetrie import DataManager
+
+MAX_BODY_BYTES = 16 * 2**20
+LOG_COLUMNS = {
+    "2D": ("result_area", "arie", "result_perimeter", "perimetru"),
+    "3D": ("result_volume", "volum"),
+}
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _clean(valoare):
+    if isinstance(valoare, float) and not math.isfinite(valoare):
+        return None
+    return valoare
+
+
+class CalculationServer:
+    def __init__(self, data_manager=None, session_id="api", cache_entries=4096, log_batch=1000,
+                 log_queue_rows=100_000):
+        self.data_manager = data_manager
+        self.session_id = session_id
+        self.log_batch = log_batch
+        self.log_queue_rows = log_queue_rows
+        self.cache = geometry_engine.ResultCache(max_entries=cache_entries)
+        self.log_written = 0
+        self.log_dropped = 0
+        self.log_failed = 0
+        self._log_queue = None
+        self._log_task = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        if self.data_manager is not None:
+            self._log_queue = asyncio.Queue(maxsize=self.log_queue_rows)
+            self._log_task = asyncio.create_task(self._drain_log())
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def stop(self):
+        if self._log_task is not None:
+            await self._log_queue.join()
+            self._log_task.cancel()
+        if self.data_manager is not None:
+            self.data_manager.close()
+
+    def _log(self, shape_type, parametri, rezultat, compute_ns):
+        if self._log_queue is None:
+            return
+        dimensiune, _ = geometry_engine.SHAPES[shape_type]
+        columns = LOG_COLUMNS[dimensiune]
+        results = {columns[i]: _clean(rezultat.get(columns[i + 1])) for i in range(0, len(columns), 2)}
+        try:
+            self._log_queue.put_nowait(dict(
+                shape_type=shape_type, shape_dimension=dimensiune, parameters=parametri,
+                calculation_time_ms=compute_ns / 1e6, compute_ns=compute_ns,
+                session_id=self.session_id, **results))
+        except asyncio.QueueFull:
+            # Like LogWriter's "drop" policy: a slow disk costs log rows, not latency.
+            self.log_dropped += 1
+
+    async def _drain_log(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._log_queue.get()]
+            while len(batch) < self.log_batch and not self._log_queue.empty():
+                batch.append(self._log_queue.get_nowait())
+            try:
+                await loop.run_in_executor(None, self._write_log, batch)
+                self.log_written += len(batch)
+            except sqlite3.Error:
+                # A locked or full database loses this batch; the task keeps draining
+                # so stop() can still join the queue.
+                self.log_failed += len(batch)
+            finally:
+                for _ in batch:
+                    self._log_queue.task_done()
+
+    def _write_log(self, batch):
+        # One transaction per batch, so a failed batch is either fully written or not at all.
+        self.data_manager.write_rows([self.data_manager.make_row(**c) for c in batch])
+
+    def log_stats(self):
+        return {
+            "depth": self._log_queue.qsize() if self._log_queue is not None else 0,
+            "capacity": self.log_queue_rows,
+            "written": self.log_written,
+            "dropped": self.log_dropped,
+            "failed": self.log_failed,
+        }
+
+    def _parameters(self, shape_type, payload):
+        _, nume = geometry_engine.shape_spec(shape_type)
+        if not isinstance(payload, dict):
+            raise RequestError(400, "parameters trebuie sa fie un obiect JSON")
+        lipsa = [n for n in nume if n not in payload]
+        if lipsa:
+            raise RequestError(400, f"Parametri lipsa pentru {shape_type}: {', '.join(lipsa)}")
+        try:
+            parametri = {n: float(payload[n]) for n in nume}
+        except (TypeError, ValueError):
+            raise RequestError(400, "Parametrii trebuie sa fie numerici") from None
+        if not all(map(math.isfinite, parametri.values())):
+            raise RequestError(400, "Parametrii trebuie sa fie numere finite")
+        return parametri
+
+    def calculate(self, payload):
+        if not isinstance(payload, dict):
+            raise RequestError(400, "Corpul cererii trebuie sa fie un obiect JSON")
+        shape_type = payload.get("shape_type")
+        if not isinstance(shape_type, str) or shape_type not in geometry_engine.SHAPES:
+            raise RequestError(400, f"Forma necunoscuta: {shape_type}")
+
+        parametri = self._parameters(shape_type, payload.get("parameters"))
+        start = time.perf_counter_ns()
+        rezultat = self.cache.compute(shape_type, parametri)
+        self._log(shape_type, parametri, rezultat, time.perf_counter_ns() - start)
+
+        return {
+            "shape_type": shape_type,
+            "shape_dimension": geometry_engine.SHAPES[shape_type][0],
+            "parameters": parametri,
+            "results": {k: _clean(v) for k, v in rezultat.items() if k != "valid"},
+            "valid": rezultat["valid"],
+        }
+
+    def calculate_batch(self, payload):
+        items = payload.get("items") if isinstance(payload, dict) else None
+        if not isinstance(items, list):
+            raise RequestError(400, "batch asteapta {\"items\": [...]}")
+
+        grupuri = {}
+        parsed = []
+        for index, item in enumerate(items):
+            shape_type = item.get("shape_type") if isinstance(item, dict) else None
+            if not isinstance(shape_type, str) or shape_type not in geometry_engine.SHAPES:
+                raise RequestError(400, f"items[{index}]: forma necunoscuta")
+            parametri = self._parameters(shape_type, item.get("parameters"))
+            parsed.append((shape_type, parametri))
+            grupuri.setdefault(shape_type, []).append(index)
+
+        raspuns = [None] * len(items)
+        for shape_type, indices in grupuri.items():
+            dimensiune, nume = geometry_engine.SHAPES[shape_type]
+            matrice = np.array([[parsed[i][1][n] for n in nume] for i in indices], dtype=np.float64)
+            start = time.perf_counter_ns()
+            calculat = geometry_engine.compute(shape_type, matrice)
+            compute_ns = (time.perf_counter_ns() - start) // len(indices)
+            coloane = {k: v.tolist() for k, v in calculat.items()}
+
+            for pozitie, index in enumerate(indices):
+                rezultat = {k: v[pozitie] for k, v in coloane.items()}
+                self._log(shape_type, parsed[index][1], rezultat, compute_ns)
+                raspuns[index] = {
+                    "shape_type": shape_type,
+                    "shape_dimension": dimensiune,
+                    "results": {k: _clean(v) for k, v in rezultat.items() if k != "valid"},
+                    "valid": rezultat["valid"],
+                }
+        return {"results": raspuns}
+
+    def route(self, method, path, body):
+        routes = {
+            "/health": ("GET", lambda: {"status": "ok", "cache": self.cache.stats(),
+                                        "log": self.log_stats()}),
+            "/calculate": ("POST", lambda: self.calculate(self._json(body))),
+            "/batch": ("POST", lambda: self.calculate_batch(self._json(body))),
+        }
+        if path not in routes:
+            raise RequestError(404, f"Ruta necunoscuta: {path}")
+        expected, handler = routes[path]
+        if method != expected:
+            raise RequestError(405, f"{path} accepta doar {expected}")
+        return handler()
+
+    @staticmethod
+    def _json(body):
+        try:
+            return json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise RequestError(400, "JSON invalid") from None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    return
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.strip() == "HTTP/1.1")
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    status, payload = 400, {"error": "Content-Length invalid"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "Corpul cererii este prea mare"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = 200, self.route(method, target.split("?", 1)[0], body)
+                    except RequestError as exc:
+                        status, payload = exc.status, {"error": str(exc)}
+                    except Exception as exc:
+                        status, payload = 500, {"error": str(exc)}
+
+                try:
+                    data = json.dumps(payload, allow_nan=False).encode()
+                except ValueError as exc:
+                    status, data = 500, json.dumps({"error": str(exc)}).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            writer.close()
+
+
+async def serve(host, port, db_path=None):
+    data_manager = DataManager(db_path, buffered=True) if db_path else None
+    server = CalculationServer(data_manager)
+    listener = await server.start(host, port)
+    print(f"Server de calcul pe http://{host}:{port} (POST /calculate, POST /batch, GET /health)")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviciu HTTP local pentru formulele geometrice")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default="geometry_analytics.db",
+                        help="Baza de date pentru jurnalizarea calculelor")
+    parser.add_argument("--no-log", action="store_true", help="Nu jurnaliza calculele in baza de date")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, None if args.no_log else args.db))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
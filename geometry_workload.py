@@ -0,0 +1,163 @@
+import argparse
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+
+import geometry_engine
+from calcul_gemoetrie import PARAMETER_COLUMNS, DataManager
+
+HOUR_PROFILES = {
+    "uniform": [1] * 24,
+    "office": [1, 1, 1, 1, 1, 2, 4, 8, 14, 18, 20, 20, 16, 18, 20, 20, 18, 12, 8, 6, 4, 3, 2, 1],
+    "evening": [3, 2, 1, 1, 1, 1, 1, 2, 3, 4, 4, 5, 6, 6, 6, 7, 8, 10, 14, 18, 20, 18, 12, 6],
+}
+
+RESULT_COLUMNS = {
+    "2D": ("arie", "perimetru", None),
+    "3D": (None, None, "volum"),
+}
+
+
+def parse_mix(text):
+    weights = {}
+    for item in text.split(","):
+        shape_type, _, weight = item.partition("=")
+        geometry_engine.shape_spec(shape_type.strip())
+        weights[shape_type.strip()] = float(weight or 1)
+    return weights
+
+
+def parse_hours(text):
+    if text in HOUR_PROFILES:
+        return HOUR_PROFILES[text]
+    weights = [float(w) for w in text.split(",")]
+    if len(weights) != 24:
+        raise ValueError("Distributia pe ore are nevoie de 24 de ponderi sau un profil: "
+                         + ", ".join(HOUR_PROFILES))
+    return weights
+
+
+def _probabilities(weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.min() < 0 or weights.sum() <= 0:
+        raise ValueError("Ponderile trebuie sa fie pozitive")
+    return weights / weights.sum()
+
+
+def _parameters(rng, shape_type, count):
+    _, names = geometry_engine.SHAPES[shape_type]
+    values = {name: np.round(rng.uniform(0.5, 100, count), 2) for name in names}
+    if "c" in values:
+        a, b = values["a"], values["b"]
+        lower, upper = np.abs(a - b), a + b
+        values["c"] = np.round(lower + (upper - lower) * rng.uniform(0.05, 0.95, count), 2)
+    return values
+
+
+def _timestamps(rng, rows, start, days, hour_probabilities, now):
+    # Sorted day by day, so ids follow time order like rows logged by the GUI,
+    # and never later than now: today only gets the hours that have passed.
+    origin = np.datetime64(start.isoformat(), "s")
+    elapsed = (np.datetime64(now.replace(tzinfo=None), "s") - origin).astype(np.int64)
+    hour_starts = np.arange(days * 24) * 3600
+    open_seconds = np.clip(elapsed - hour_starts, 0, 3600)
+    weights = np.tile(hour_probabilities, days) * open_seconds
+    if weights.sum() <= 0:
+        raise ValueError("Intervalul generat nu are nicio ora din trecut")
+
+    per_day = weights.reshape(days, 24)
+    counts = rng.multinomial(rows, per_day.sum(axis=1) / weights.sum())
+    for day, count in enumerate(counts.tolist()):
+        if not count:
+            continue
+        hour = rng.choice(24, count, p=per_day[day] / per_day[day].sum())
+        seconds = (rng.random(count) * open_seconds[day * 24 + hour]).astype(np.int64)
+        offsets = np.sort(day * 86400 + hour * 3600 + seconds)
+        moments = origin + offsets.astype("timedelta64[s]")
+        yield np.char.replace(np.datetime_as_string(moments, unit="s"), "T", " ").tolist()
+
+
+def generate_chunks(rows, shape_weights=None, sessions=100, start=None, days=7,
+                    hour_weights=None, chunk_rows=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    shape_weights = shape_weights or {shape_type: 1 for shape_type in geometry_engine.SHAPES}
+    shape_types = list(shape_weights)
+    shape_probabilities = _probabilities([shape_weights[s] for s in shape_types])
+    hour_probabilities = _probabilities(hour_weights or HOUR_PROFILES["uniform"])
+    now = datetime.now(timezone.utc)
+    if start is None:
+        start = now.date() - timedelta(days=days - 1)
+    session_names = np.array([f"session_{i}" for i in range(max(1, sessions))])
+    stream = _timestamps(rng, rows, start, days, hour_probabilities, now)
+    pending = []
+
+    for offset in range(0, rows, chunk_rows):
+        count = min(chunk_rows, rows - offset)
+        shapes = rng.choice(len(shape_types), count, p=shape_probabilities)
+        while len(pending) < count:
+            pending += next(stream)
+        timestamps, pending = pending[:count], pending[count:]
+        session_ids = session_names[rng.integers(0, len(session_names), count)].tolist()
+        compute_ns = rng.lognormal(np.log(20_000), 0.6, count).astype(np.int64)
+        log_ns = rng.lognormal(np.log(5_000), 0.5, count).astype(np.int64)
+        render_ns = rng.lognormal(np.log(20_000_000), 0.5, count).astype(np.int64)
+
+        chunk = [None] * count
+        for index, shape_type in enumerate(shape_types):
+            positions = np.flatnonzero(shapes == index)
+            if not len(positions):
+                continue
+            dimension, names = geometry_engine.SHAPES[shape_type]
+            values = _parameters(rng, shape_type, len(positions))
+            computed = geometry_engine.compute(shape_type, values)
+            area, perimeter, volume = (computed[name].tolist() if name else [None] * len(positions)
+                                       for name in RESULT_COLUMNS[dimension])
+            columns = [values[name].tolist() if name in values else None
+                       for name in PARAMETER_COLUMNS]
+
+            for i, row in enumerate(positions.tolist()):
+                ns = int(compute_ns[row])
+                chunk[row] = (shape_type, dimension, area[i], perimeter[i], volume[i], ns / 1e6,
+                              timestamps[row], session_ids[row], ns, int(log_ns[row]),
+                              int(render_ns[row]),
+                              *[column[i] if column is not None else None for column in columns])
+        yield chunk
+
+
+def generate(db_path, rows, **options):
+    data_manager = DataManager(db_path)
+    start = time.perf_counter()
+    written = data_manager.bulk_load(generate_chunks(rows, **options))
+    return written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genereaza calcule sintetice in geometry_analytics.db")
+    parser.add_argument("rows", type=int, help="Numarul de calcule generate")
+    parser.add_argument("--db", default="geometry_analytics.db")
+    parser.add_argument("--mix", type=parse_mix,
+                        help="Ponderile formelor, de ex. cerc=3,cub=1 (implicit toate egal)")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--hours", type=parse_hours, default="uniform",
+                        help=f"Profil ({', '.join(HOUR_PROFILES)}) sau 24 de ponderi separate prin virgula")
+    parser.add_argument("--start", type=date.fromisoformat,
+                        help="Prima zi (YYYY-MM-DD); implicit ultimele --days zile")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.start is not None and args.start > datetime.now(timezone.utc).date():
+        parser.error(f"--start {args.start} este in viitor; calculele generate nu pot depasi ora curenta")
+
+    rows, elapsed = generate(args.db, args.rows, shape_weights=args.mix, sessions=args.sessions,
+                             start=args.start, days=args.days, hour_weights=args.hours,
+                             chunk_rows=args.chunk_rows, seed=args.seed)
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{rows} calcule generate in {args.db} in {elapsed:.2f}s ({rate:,.0f} randuri/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
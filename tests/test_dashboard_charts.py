@@ -0,0 +1,36 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from calcul_gemoetrie import DashboardCharts
+
+
+def _stats(scale=1, shift=0):
+    return {
+        'shapes_frequency': {'cerc': 10 + shift, 'cub': 20, 'sfera': 5 + 3 * shift},
+        'dimensions_frequency': {'2D': 10 + shift, '3D': 25 + 3 * shift},
+        'calculations_by_hour': {hour: (hour % 5 + 1) * scale for hour in range(24)},
+        'calculations_by_day': {f'2026-10-{day:02d}': day for day in range(11, 18)},
+    }
+
+
+def test_partial_redraw_matches_a_full_draw():
+    charts = DashboardCharts(Figure(figsize=(12, 8), dpi=100))
+    canvas = FigureCanvasAgg(charts.figure)
+    charts.redraw(canvas, charts.update(_stats()))
+
+    drawn = []
+    draw = canvas.draw
+    canvas.draw = lambda: drawn.append(1) or draw()
+    for stats in (_stats(scale=1000), _stats(scale=1000, shift=40)):
+        changed = charts.update(stats)
+        assert 0 < len(changed) < 4
+        charts.redraw(canvas, changed)
+        partial = np.asarray(canvas.buffer_rgba()).copy()
+        reference = FigureCanvasAgg(charts.figure)
+        reference.draw()
+        charts.figure.set_canvas(canvas)
+        assert np.array_equal(partial, np.asarray(reference.buffer_rgba()))
+    assert drawn == []
+
+    assert charts.update(_stats(scale=1000, shift=40)) == []
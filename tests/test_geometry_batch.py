@@ -0,0 +1,44 @@
+import csv
+
+import pytest
+
+import geometry_batch
+
+
+def _run(tmp_path, lines, **options):
+    source = tmp_path / "shapes.csv"
+    source.write_text("\n".join(lines) + "\n")
+    output = tmp_path / "results.csv"
+    rows, _ = geometry_batch.run_batch(str(source), str(output), **options)
+    with open(output, newline="") as f:
+        return rows, list(csv.DictReader(f))
+
+
+def test_malformed_rows_only_invalidate_themselves(tmp_path):
+    rows, results = _run(tmp_path, [
+        "shape_type,raza,a,b,c",
+        "cerc,2",
+        "",
+        "cerc,abc",
+        "triunghi,,3,4,5",
+        "cerc,1,,,,,extra",
+        "cerc,inf",
+        "triunghi,,1,1,5",
+    ])
+
+    assert rows == 6
+    assert [(row["shape_type"], row["valid"]) for row in results] == [
+        ("cerc", "1"), ("cerc", "0"), ("triunghi", "1"), ("cerc", "1"), ("cerc", "0"), ("triunghi", "0")]
+    assert float(results[0]["arie"]) == pytest.approx(12.566370614359172)
+    assert results[1]["raza"] == ""
+    assert float(results[2]["arie"]) == pytest.approx(6.0)
+
+
+def test_workers_match_single_process(tmp_path):
+    lines = ["shape_type,lungime,latime,raza,a,b,c,inaltime"]
+    lines += [f"{shape},{i % 7 + 1},{i % 5 + 1},{i % 3 + 1},3,4,{i % 8 + 1},{i % 4 + 1}"
+              for i in range(300) for shape in ("dreptunghi", "cerc", "prisma")]
+
+    single = _run(tmp_path, lines, chunk_size=250)
+    parallel = _run(tmp_path, lines, chunk_size=250, workers=2)
+    assert parallel == single
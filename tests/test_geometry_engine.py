@@ -0,0 +1,72 @@
+import math
+
+import numpy as np
+import pytest
+
+import geometry_engine
+
+
+def _heron(a, b, c):
+    if (a + b > c) and (a + c > b) and (b + c > a):
+        s = (a + b + c) / 2
+        return math.sqrt(s * (s - a) * (s - b) * (s - c))
+    return None
+
+
+# The scalar formulas of the original calculator, before geometry_engine.
+BASELINE = {
+    "dreptunghi": lambda lungime, latime: {"arie": lungime * latime,
+                                           "perimetru": 2 * (lungime + latime)},
+    "patrat": lambda latura: {"arie": latura * latura, "perimetru": 4 * latura},
+    "cerc": lambda raza: {"arie": math.pi * raza * raza, "perimetru": 2 * math.pi * raza},
+    "triunghi": lambda a, b, c: None if _heron(a, b, c) is None else {
+        "arie": _heron(a, b, c), "perimetru": a + b + c},
+    "cub": lambda latura: {"volum": latura ** 3, "arie_totala": 6 * latura ** 2},
+    "paralelpiped": lambda lungime, latime, inaltime: {
+        "volum": lungime * latime * inaltime,
+        "arie_totala": 2 * (lungime * latime + lungime * inaltime + latime * inaltime)},
+    "sfera": lambda raza: {"volum": (4/3) * math.pi * raza ** 3, "arie_totala": 4 * math.pi * raza ** 2},
+    "prisma": lambda a, b, c, inaltime: None if _heron(a, b, c) is None else {
+        "volum": _heron(a, b, c) * inaltime, "arie_baza": _heron(a, b, c)},
+}
+
+
+@pytest.mark.parametrize("shape_type", sorted(geometry_engine.SHAPES))
+def test_compute_matches_baseline_formulas(shape_type):
+    _, names = geometry_engine.SHAPES[shape_type]
+    rng = np.random.default_rng(len(shape_type))
+    matrix = np.round(rng.uniform(0.5, 20, (500, len(names))), 2)
+
+    computed = geometry_engine.compute(shape_type, matrix)
+    for row, values in enumerate(matrix.tolist()):
+        expected = BASELINE[shape_type](*values)
+        assert bool(computed["valid"][row]) is (expected is not None)
+        if expected is None:
+            assert all(math.isnan(computed[name][row]) for name in computed if name != "valid")
+            continue
+        for name, value in expected.items():
+            assert computed[name][row] == pytest.approx(value, rel=1e-12)
+
+
+@pytest.mark.parametrize("shape_type", ["triunghi", "prisma"])
+def test_triangle_mask(shape_type):
+    sides = np.array([[3, 4, 5], [1, 2, 3], [1, 1, 5], [5, 1, 1], [2, 2, 3.9], [0.1, 10, 10]], dtype=float)
+    parameters = {"a": sides[:, 0], "b": sides[:, 1], "c": sides[:, 2], "inaltime": np.full(len(sides), 2.0)}
+
+    computed = geometry_engine.compute(shape_type, parameters)
+    assert computed["valid"].tolist() == [True, False, False, False, True, True]
+    area = computed["arie"] if shape_type == "triunghi" else computed["arie_baza"]
+    assert area[0] == pytest.approx(6.0)
+    assert np.isnan(area[1:4]).all()
+
+
+def test_compute_accepts_dict_and_matrix():
+    matrix = np.array([[2.0, 3.0], [4.0, 5.0]])
+    by_dict = geometry_engine.compute("dreptunghi", {"lungime": matrix[:, 0], "latime": matrix[:, 1]})
+    by_matrix = geometry_engine.compute("dreptunghi", matrix)
+    assert by_dict["arie"].tolist() == by_matrix["arie"].tolist() == [6.0, 20.0]
+
+    with pytest.raises(ValueError):
+        geometry_engine.compute("dreptunghi", {"lungime": 1.0})
+    with pytest.raises(ValueError):
+        geometry_engine.compute("hexagon", matrix)
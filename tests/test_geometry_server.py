@@ -0,0 +1,101 @@
+import asyncio
+import json
+import sqlite3
+
+import pytest
+
+from calcul_gemoetrie import DataManager
+from geometry_server import CalculationServer, RequestError
+
+
+def test_non_finite_parameters_are_rejected():
+    server = CalculationServer()
+    for value in ("nan", float("inf"), "-Infinity"):
+        with pytest.raises(RequestError) as error:
+            server.calculate({"shape_type": "cerc", "parameters": {"raza": value}})
+        assert error.value.status == 400
+
+
+def test_non_string_shape_type_is_rejected():
+    server = CalculationServer()
+    for shape_type in (["cerc"], {"cerc": 1}, 3):
+        with pytest.raises(RequestError) as error:
+            server.calculate({"shape_type": shape_type, "parameters": {"raza": 1}})
+        assert error.value.status == 400
+        with pytest.raises(RequestError) as error:
+            server.calculate_batch({"items": [{"shape_type": shape_type, "parameters": {"raza": 1}}]})
+        assert error.value.status == 400
+
+
+@pytest.mark.filterwarnings("ignore:overflow:RuntimeWarning")
+def test_overflowing_results_become_null():
+    response = CalculationServer().calculate({"shape_type": "sfera", "parameters": {"raza": 1e200}})
+    assert response["results"] == {"volum": None, "arie_totala": None}
+    json.dumps(response, allow_nan=False)
+
+
+async def _exchange(requests):
+    server = CalculationServer()
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    responses = []
+    try:
+        for request in requests:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            await writer.drain()
+            head, _, body = (await asyncio.wait_for(reader.read(), 5)).partition(b"\r\n\r\n")
+            writer.close()
+            responses.append((int(head.split()[1]), json.loads(body)))
+    finally:
+        listener.close()
+        await listener.wait_closed()
+        await server.stop()
+    return responses
+
+
+def test_invalid_content_length():
+    body = b'{"shape_type": "cerc", "parameters": {"raza": 1}}'
+    responses = asyncio.run(_exchange([
+        b"POST /calculate HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+        b"POST /calculate HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+        b"POST /calculate HTTP/1.1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body),
+    ]))
+
+    assert [status for status, _ in responses] == [400, 400, 200]
+    assert responses[2][1]["results"]["arie"] == pytest.approx(3.141592653589793)
+
+
+def test_log_queue_survives_write_errors_and_overflow(tmp_path, monkeypatch):
+    data_manager = DataManager(str(tmp_path / "server.db"), buffered=True)
+    write_rows = data_manager.write_rows
+    batches = []
+
+    def locked_once(rows):
+        batches.append(len(rows))
+        if len(batches) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        write_rows(rows)
+
+    monkeypatch.setattr(data_manager, "write_rows", locked_once)
+
+    async def run():
+        server = CalculationServer(data_manager, log_batch=2, log_queue_rows=3)
+        listener = await server.start("127.0.0.1", 0)
+        listener.close()
+        for raza in range(1, 6):
+            server.calculate({"shape_type": "cerc", "parameters": {"raza": raza}})
+        await asyncio.wait_for(server._log_queue.join(), 5)
+        server.calculate({"shape_type": "cub", "parameters": {"latura": 2}})
+        stats = server.log_stats()
+        await asyncio.wait_for(server.stop(), 5)
+        return stats, server.log_stats()
+
+    before_stop, after_stop = asyncio.run(run())
+
+    assert before_stop["dropped"] == 2 and before_stop["failed"] == 2
+    assert after_stop["written"] == 2 and after_stop["depth"] == 0
+    assert batches == [2, 1, 1]
+    with sqlite3.connect(tmp_path / "server.db") as conn:
+        assert conn.execute("SELECT shape_type FROM calculations ORDER BY id").fetchall() == [
+            ("cerc",), ("cub",)]
@@ -0,0 +1,19 @@
+import pytest
+
+import geometry_workload
+
+
+def test_3d_rows_log_only_the_volume():
+    rows = [row for chunk in geometry_workload.generate_chunks(2000, chunk_rows=500)
+            for row in chunk]
+    solids = [row for row in rows if row[1] == "3D"]
+    assert solids and all(row[2] is None and row[3] is None and row[4] > 0 for row in solids)
+    assert all(row[2] > 0 and row[4] is None for row in rows if row[1] == "2D")
+
+
+def test_start_in_the_future_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        geometry_workload.main(["10", "--db", str(tmp_path / "w.db"), "--start", "2999-01-01"])
+    assert exit_info.value.code == 2
+    assert "--start" in capsys.readouterr().err
+    assert not (tmp_path / "w.db").exists()
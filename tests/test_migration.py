@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+
+from calcul_gemoetrie import PARAMETER_COLUMNS, DataManager
+
+BASELINE_TABLE = '''
+    CREATE TABLE calculations (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        shape_type TEXT {not_null},
+        shape_dimension TEXT NOT NULL,
+        parameters TEXT NOT NULL,
+        result_area REAL,
+        result_perimeter REAL,
+        result_volume REAL,
+        calculation_time_ms REAL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+        session_id TEXT
+    )
+'''
+ROWS = [
+    ("cerc", "2D", '{"raza": 2.5}', 19.63, 15.71, None, 0.4, "2026-09-01 10:00:00", "s1"),
+    ("prisma", "3D", '{"a": 3, "b": 4, "c": 5, "inaltime": 10}', None, None, 60.0, 0.2,
+     "2026-09-01 11:30:00", "s1"),
+    ("dreptunghi", "2D", '{"lungime": 4, "latime": 3}', 12.0, 14.0, None, 0.0, "2026-09-02 09:15:00", "s2"),
+    ("cerc", "2D", '{raza: oops', 3.14, 6.28, None, 0.1, "2026-09-02 09:20:00", "s2"),
+]
+
+
+def _baseline_db(path, rows=ROWS, not_null="NOT NULL"):
+    conn = sqlite3.connect(path)
+    conn.execute(BASELINE_TABLE.format(not_null=not_null))
+    conn.executemany('''
+        INSERT INTO calculations (shape_type, shape_dimension, parameters, result_area, result_perimeter,
+                                  result_volume, calculation_time_ms, timestamp, session_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+
+def _tables(conn):
+    return {name for name, in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def test_baseline_database_is_migrated(tmp_path):
+    path = str(tmp_path / "baseline.db")
+    _baseline_db(path)
+
+    DataManager(path)
+
+    conn = sqlite3.connect(path)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(calculations)')]
+    assert 'parameters' not in columns
+    assert set(PARAMETER_COLUMNS) <= set(columns)
+    assert 'calculations_json' not in _tables(conn)
+
+    rows = conn.execute('SELECT id, shape_type, raza, a, b, c, inaltime, lungime, latime, result_volume '
+                        'FROM calculations ORDER BY id').fetchall()
+    assert rows == [
+        (1, "cerc", 2.5, None, None, None, None, None, None, None),
+        (2, "prisma", None, 3.0, 4.0, 5.0, 10.0, None, None, 60.0),
+        (3, "dreptunghi", None, None, None, None, None, 4.0, 3.0, None),
+        (4, "cerc", None, None, None, None, None, None, None, None),
+    ]
+    assert conn.execute('SELECT typeof(raza) FROM calculations WHERE id = 1').fetchone() == ('real',)
+
+    daily = dict(conn.execute('SELECT day, SUM(calculations) FROM calculations_daily GROUP BY day'))
+    assert daily == {"2026-09-01": 2, "2026-09-02": 2}
+    conn.close()
+
+
+def test_failed_copy_rolls_back(tmp_path):
+    path = str(tmp_path / "broken.db")
+    _baseline_db(path, ROWS + [(None, "2D", '{"raza": 1}', 1.0, 1.0, None, 0.1, "2026-09-03 08:00:00", "s3")],
+                 not_null="")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        DataManager(path)
+
+    conn = sqlite3.connect(path)
+    assert 'calculations_json' not in _tables(conn)
+    assert 'parameters' in [row[1] for row in conn.execute('PRAGMA table_info(calculations)')]
+    assert conn.execute('SELECT COUNT(*) FROM calculations').fetchone() == (len(ROWS) + 1,)
+    conn.close()
+
+
+def test_interrupted_migration_is_finished(tmp_path):
+    path = str(tmp_path / "interrupted.db")
+    _baseline_db(path)
+    conn = sqlite3.connect(path)
+    conn.execute('ALTER TABLE calculations RENAME TO calculations_json')
+    conn.execute(DataManager.TABLE_SQL)
+    conn.commit()
+    conn.close()
+
+    DataManager(path)
+
+    conn = sqlite3.connect(path)
+    assert 'calculations_json' not in _tables(conn)
+    assert conn.execute('SELECT id, raza FROM calculations WHERE shape_type = ? ORDER BY id',
+                        ("cerc",)).fetchall() == [(1, 2.5), (4, None)]
+    conn.close()
+
+
+def test_migrated_database_opens_again(tmp_path):
+    path = str(tmp_path / "baseline.db")
+    _baseline_db(path)
+    DataManager(path)
+
+    with DataManager(path, buffered=True) as data_manager:
+        data_manager.log_calculation("cerc", "2D", {"raza": 1.0}, result_area=3.14)
+    stats = DataManager(path).parameter_statistics("cerc", days=100000)
+    assert stats["raza"]["count"] == 2
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from calcul_gemoetrie import CalculatorGeometrie, RenderCache, ShapeView3D, StageProfiler
+
+
+def _view():
+    view = ShapeView3D(Figure(figsize=(6, 5), dpi=100))
+    canvas = FigureCanvasAgg(view.figure)
+    view.attach(canvas)
+    return view, canvas
+
+
+def test_render_key_includes_sphere_detail_and_interaction():
+    view, _ = _view()
+    fine = view.render_key(("sfera", 2.0))
+    view.interactive = True
+    coarse = view.render_key(("sfera", 2.0))
+
+    assert fine[1] > coarse[1] == view.coarse_resolution
+    assert fine[2] is False and coarse[2] is True
+    assert view.render_key(("cub", 2.0))[1] is None
+
+
+def test_cache_hit_restores_the_bitmap_without_building_artists(monkeypatch):
+    view, canvas = _view()
+    app = SimpleNamespace(view_3d=view, canvas_3d=canvas, render_cache=RenderCache(),
+                          profiler=StageProfiler(), ensure_view_3d=lambda: view)
+
+    CalculatorGeometrie._draw_3d(app, ("cub", 3.0), "draw_cube", 3.0)
+    CalculatorGeometrie._draw_3d(app, ("sfera", 2.0), "draw_sphere", 2.0)
+
+    built = []
+    draw_cube = view.draw_cube
+    monkeypatch.setattr(view, "draw_cube", lambda *args: built.append(args) or draw_cube(*args))
+    CalculatorGeometrie._draw_3d(app, ("cub", 3.0), "draw_cube", 3.0)
+
+    assert app.render_cache.hits == 1 and built == []
+    assert view.shown == ("cub", 3.0) and view._sphere == 2.0
+
+    # The first interaction rebuilds the deferred shape before anything redraws it.
+    view._set_interactive(True)
+    assert built == [(3.0,)] and view._sphere is None
+    assert view.shown == ("cub", 3.0)
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from calcul_gemoetrie import DataManager
+
+ROWS = 2000
+DAYS = 90
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "history.db")
+    data_manager = DataManager(path)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(ROWS):
+        row = data_manager.make_row("cerc" if i % 3 else "cub", "2D" if i % 3 else "3D", {"raza": float(i)},
+                                    result_area=float(i), calculation_time_ms=0.5, compute_ns=1000 + i)
+        # Ids do not follow time order, as with bulk-loaded or imported data.
+        moment = now - timedelta(minutes=(i * 7919) % (DAYS * 24 * 60))
+        rows.append(row[:6] + (moment.strftime('%Y-%m-%d %H:%M:%S'),) + row[7:])
+    data_manager.write_rows(rows)
+    return data_manager, sorted(rows, key=lambda row: row[6])
+
+
+def _cutoff(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d 00:00:00')
+
+
+def _daily(path):
+    conn = sqlite3.connect(path)
+    daily = dict(conn.execute('SELECT day, SUM(calculations) FROM calculations_daily GROUP BY day'))
+    conn.close()
+    return daily
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    count = conn.execute('SELECT COUNT(*) FROM calculations').fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_archive_moves_old_rows(database):
+    data_manager, rows = database
+    old = sum(row[6] < _cutoff(30) for row in rows)
+
+    result = data_manager.apply_retention(30, archive=True, hourly_days=None)
+
+    assert result['archived'] == result['deleted'] == old
+    assert sorted(result['partitions']) == data_manager.partition_paths()
+    assert _count(data_manager.db_path) == ROWS - old
+    assert sum(_count(path) for path in data_manager.partition_paths()) == old
+    for path in data_manager.partition_paths():
+        conn = sqlite3.connect(path)
+        month = os.path.splitext(path)[0][-7:]
+        assert {m for m, in conn.execute('SELECT DISTINCT substr(timestamp, 1, 7) FROM calculations')} == {month}
+        conn.close()
+
+    again = data_manager.apply_retention(30, archive=True, hourly_days=None)
+    assert again['archived'] == 0
+    assert sum(_count(path) for path in data_manager.partition_paths()) == old
+
+
+def test_delete_without_archive(database):
+    data_manager, rows = database
+    old = sum(row[6] < _cutoff(30) for row in rows)
+
+    result = data_manager.apply_retention(30, archive=False, hourly_days=None)
+
+    assert result == {'archived': 0, 'deleted': old, 'partitions': []}
+    assert data_manager.partition_paths() == []
+    assert _count(data_manager.db_path) == ROWS - old
+    assert sum(_daily(data_manager.db_path).values()) == ROWS
+
+
+def test_history_pages_across_archives(database):
+    data_manager, rows = database
+    data_manager.apply_retention(30, archive=True, hourly_days=None)
+
+    expected = [(row[6], row[2]) for row in reversed(rows)]
+    seen = []
+    page = data_manager.history_page(limit=137)
+    while page:
+        seen += [(row[2], row[3]) for row in page]
+        page = data_manager.history_page(before=DataManager.history_key(page[-1]), limit=137)
+    assert seen == expected
+
+    middle = data_manager.history_page(limit=500)[-1]
+    newer = data_manager.history_newer(DataManager.history_key(middle), limit=1000)
+    assert [row[3] for row in newer] == [area for _, area in expected[:499]]
+
+    exported = [row for batch in data_manager.iter_calculations(batch_rows=300) for row in batch]
+    assert len(exported) == ROWS
+    assert len(list(data_manager.iter_calculations(archived=False))) < len(exported)
+
+
+def test_rebuild_keeps_archived_days(database):
+    data_manager, _ = database
+    before = _daily(data_manager.db_path)
+    data_manager.apply_retention(30, archive=True, hourly_days=45)
+
+    data_manager.rebuild_rollups()
+
+    assert _daily(data_manager.db_path) == before
+    assert sum(before.values()) == ROWS
+    conn = sqlite3.connect(data_manager.db_path)
+    oldest_bucket = conn.execute('SELECT MIN(bucket) FROM calculations_hourly').fetchone()[0]
+    conn.close()
+    assert oldest_bucket >= (datetime.now(timezone.utc) - timedelta(days=45)).strftime('%Y-%m-%d %H')
+
+
+def test_flushed_rollups_match_a_rebuild(tmp_path):
+    path = str(tmp_path / "rollups.db")
+    with DataManager(path, buffered=True, flush_rows=700) as data_manager:
+        for i in range(2000):
+            data_manager.log_calculation(
+                "cerc" if i % 2 else "cub", "2D" if i % 2 else "3D", {"raza": float(i)},
+                result_area=1.0 if i % 2 else None, result_volume=None if i % 2 else 2.0,
+                calculation_time_ms=(0.25 if i % 3 else None), compute_ns=(1000 + i if i % 5 else None),
+                log_ns=0 if i % 7 == 0 else 500)
+
+    def rollups():
+        conn = sqlite3.connect(path)
+        tables = [conn.execute(f'SELECT * FROM {table} ORDER BY 1, 2, 3').fetchall()
+                  for table in ('calculations_hourly', 'calculations_daily', 'calculation_spans_hourly')]
+        conn.close()
+        return tables
+
+    conn = sqlite3.connect(path)
+    # Missing values are bound as NaN, which SQLite stores as NULL.
+    assert conn.execute('SELECT COUNT(*) FROM calculations WHERE result_volume IS NULL '
+                        'AND render_ns IS NULL AND lungime IS NULL').fetchone() == (1000,)
+    conn.close()
+
+    flushed = rollups()
+    DataManager(path).rebuild_rollups()
+    assert flushed == rollups()
+    assert sum(row[3] for row in flushed[1]) == 2000
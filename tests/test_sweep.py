@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+import geometry_engine
+
+
+def _meshgrid(shape_type, grid):
+    _, names = geometry_engine.SHAPES[shape_type]
+    axes = [np.atleast_1d(np.asarray(grid[name], dtype=np.float64)) for name in names]
+    mesh = dict(zip(names, np.meshgrid(*axes, indexing="ij")))
+    return mesh, geometry_engine.FORMULAS[shape_type](*mesh.values())
+
+
+@pytest.mark.parametrize("shape_type, grid, block_size", [
+    ("triunghi", {"a": np.linspace(1, 10, 23), "b": np.linspace(1, 10, 19), "c": np.linspace(0.5, 12, 31)}, 50),
+    ("prisma", {"a": np.linspace(1, 5, 7), "b": np.linspace(1, 5, 9), "c": np.linspace(1, 5, 11),
+                "inaltime": [1.0, 2.5, 4.0]}, 64),
+    ("dreptunghi", {"lungime": np.linspace(0.1, 3, 40), "latime": np.linspace(0.1, 2, 25)}, 7),
+    ("sfera", {"raza": np.linspace(0.1, 5, 101)}, 10),
+])
+def test_sweep_matches_meshgrid(shape_type, grid, block_size):
+    mesh, computed = _meshgrid(shape_type, grid)
+    targets = [name for name in computed if name != "valid"]
+
+    summary = geometry_engine.sweep(shape_type, grid, block_size=block_size)
+
+    assert summary["points"] == computed["valid"].size
+    assert summary["selected"] == int(computed["valid"].sum())
+    for name in targets:
+        values = computed[name][computed["valid"] & ~np.isnan(computed[name])]
+        assert summary[name]["count"] == values.size
+        assert summary[name]["min"] == pytest.approx(values.min())
+        assert summary[name]["max"] == pytest.approx(values.max())
+        assert summary[name]["mean"] == pytest.approx(values.mean())
+
+        argmin = summary[name]["argmin"]
+        point = geometry_engine.FORMULAS[shape_type](*argmin.values())
+        assert float(point[name]) == pytest.approx(values.min())
+
+
+def test_sweep_where_and_histograms():
+    grid = {"a": np.linspace(1, 6, 26), "b": np.linspace(1, 6, 26), "c": np.linspace(1, 6, 26)}
+    mesh, computed = _meshgrid("triunghi", grid)
+    selected = computed["valid"] & (mesh["a"] <= mesh["b"]) & (computed["arie"] > 2)
+
+    summary = geometry_engine.sweep(
+        "triunghi", grid, targets=["arie"], block_size=100,
+        where=lambda values, results: (values["a"] <= values["b"]) & (results["arie"] > 2),
+        histograms={"perimetru": (12, (0, 18))})
+
+    assert summary["selected"] == int(selected.sum())
+    assert summary["arie"]["count"] == int(selected.sum())
+    assert summary["arie"]["max"] == pytest.approx(computed["arie"][selected].max())
+    counts, edges = summary["perimetru"]["histogram"]
+    expected, _ = np.histogram(computed["perimetru"][selected], bins=np.linspace(0, 18, 13))
+    assert counts.tolist() == expected.tolist()
+    assert edges.tolist() == pytest.approx(np.linspace(0, 18, 13).tolist())
+
+
+def test_sweep_without_valid_points():
+    summary = geometry_engine.sweep("triunghi", {"a": [1.0], "b": [1.0], "c": [5.0, 6.0]})
+    assert summary["selected"] == 0
+    assert summary["arie"]["count"] == 0
+    assert np.isnan(summary["arie"]["min"])